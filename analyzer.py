@@ -4,11 +4,75 @@ Provides natural language querying capabilities for stock data.
 """
 
 import os
+import asyncio
+import functools
+import hashlib
+import json
+import re
+import threading
+import httpx
 import pandas as pd
+from diskcache import Cache
 from langchain_experimental.agents.agent_toolkits import create_csv_agent
 from langchain_groq import ChatGroq
-from config import GROQ_API_KEY, MODEL_TEMPERATURE, STANDARD_QUERIES
-from data_processor import load_stock_data, save_analysis_results
+from config import (
+    MODEL_TEMPERATURE,
+    STANDARD_QUERIES,
+    MAX_CONCURRENT_QUERIES,
+    STANDARD_QUERY_BATCH_SIZE,
+    QUERY_CACHE_DIR,
+    HTTP_MAX_CONNECTIONS,
+    HTTP_MAX_KEEPALIVE_CONNECTIONS,
+    HTTP_TIMEOUT,
+    FAST_MODEL_NAME,
+    SEMANTIC_CACHE_TTL,
+    get_groq_api_key
+)
+from data_processor import load_stock_data, save_analysis_results, build_symbol_index
+from cache import SemanticCache
+
+@functools.lru_cache(maxsize=None)
+def get_llm(api_key, temperature, model=None):
+    """
+    Get a ChatGroq client, created once per API key, temperature and model.
+    
+    Args:
+        api_key (str): Groq API key
+        temperature (float): Model temperature
+        model (str, optional): Groq model name. Defaults to the ChatGroq default.
+        
+    Returns:
+        ChatGroq: Shared LLM client
+    """
+    # Pooled HTTP/2 client so concurrent async calls multiplex over few connections
+    http_async_client = httpx.AsyncClient(
+        limits=httpx.Limits(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive_connections=HTTP_MAX_KEEPALIVE_CONNECTIONS
+        ),
+        http2=True,
+        timeout=HTTP_TIMEOUT
+    )
+    model_kwargs = {"model": model} if model else {}
+    return ChatGroq(
+        api_key=api_key,
+        temperature=temperature,
+        streaming=True,
+        http_async_client=http_async_client,
+        **model_kwargs
+    )
+
+# Async batches all run on one event loop so pooled connections stay usable between runs
+_event_loop = None
+_event_loop_lock = threading.Lock()
+
+def _run_async(coro):
+    """Run a coroutine to completion on the shared event loop."""
+    global _event_loop
+    with _event_loop_lock:
+        if _event_loop is None:
+            _event_loop = asyncio.new_event_loop()
+        return _event_loop.run_until_complete(coro)
 
 class StockAnalyzer:
     """
@@ -16,6 +80,20 @@ class StockAnalyzer:
     Provides natural language interface for stock data analysis.
     """
     
+    # Simple lookups answered directly from the data, without calling the LLM
+    _INTENT_PATTERNS = [
+        (re.compile(r"what is the (?:stock )?price of ([A-Z]{1,5})\??", re.IGNORECASE), "_answer_price"),
+        (re.compile(r"what is the performance of ([A-Z]{1,5})\??", re.IGNORECASE), "_answer_performance"),
+        (re.compile(r"what is the (?:PE|P/E) ratio of ([A-Z]{1,5})\??", re.IGNORECASE), "_answer_pe_ratio"),
+        (re.compile(r"what is the market cap of ([A-Z]{1,5})\??", re.IGNORECASE), "_answer_market_cap"),
+        (re.compile(r"which stock has the highest price\??", re.IGNORECASE), "_answer_highest_price"),
+        (re.compile(r"what is the average (?:stock )?price\??", re.IGNORECASE), "_answer_average_price"),
+        (re.compile(r"which sector has the most stocks\??", re.IGNORECASE), "_answer_top_sector"),
+    ]
+    
+    # Prefix the ReAct agent puts before its answer; text before it is reasoning
+    _FINAL_ANSWER_MARKER = "Final Answer:"
+    
     def __init__(self, data_file, api_key=None, temperature=None):
         """
         Initialize the stock analyzer.
@@ -26,18 +104,16 @@ class StockAnalyzer:
             temperature (float, optional): Model temperature. Defaults to config value.
         """
         self.data_file = data_file
-        self.api_key = api_key or GROQ_API_KEY
+        self.data_mtime = os.path.getmtime(data_file)
+        self.api_key = api_key or get_groq_api_key()
         self.temperature = temperature or MODEL_TEMPERATURE
         
         # Check for API key
         if not self.api_key:
             raise ValueError("Groq API key is required. Set it in .env file or pass directly.")
         
-        # Set up LLM
-        self.llm = ChatGroq(
-            api_key=self.api_key,
-            temperature=self.temperature
-        )
+        # Set up LLM (shared client, so its connection pool is reused)
+        self.llm = get_llm(self.api_key, self.temperature)
         
         # Create agent
         self.agent = create_csv_agent(
@@ -46,6 +122,136 @@ class StockAnalyzer:
             verbose=True,
             allow_dangerous_code=True
         )
+        
+        # Data for answering simple lookups locally
+        self.df = pd.read_csv(self.data_file).drop_duplicates(subset=['Stock Symbol'])
+        self.sym_index = build_symbol_index(self.df)
+        
+        # Smaller, faster model for the mechanical standard queries
+        self.fast_llm = get_llm(self.api_key, 0, FAST_MODEL_NAME)
+        
+        # Cache responses: exact repeats hit the on-disk cache,
+        # paraphrased repeats hit the semantic cache
+        self.disk_cache = Cache(QUERY_CACHE_DIR)
+        self.cache = SemanticCache()
+    
+    @functools.cached_property
+    def fast_agent(self):
+        """CSV agent on the fast model, created on first use."""
+        return create_csv_agent(
+            self.fast_llm,
+            self.data_file,
+            verbose=True,
+            allow_dangerous_code=True
+        )
+    
+    @functools.cached_property
+    def data_csv(self):
+        """Stock data as CSV text for the batched prompts, serialized on first use."""
+        return self.df.to_csv(index=False)
+    
+    def _cache_namespace(self, fast=False):
+        """
+        Cache namespace for this version of the data file and the model answering.
+        
+        Answers go stale when the data changes, and the fast model's answers to
+        the standard queries are never served to user queries, or vice versa.
+        """
+        llm = self.fast_llm if fast else self.llm
+        return f"{self.data_file}|{self.data_mtime}|{llm.model_name}|{llm.temperature}"
+    
+    def _query_hash(self, query, fast=False):
+        """Deterministic cache key for a query against this data file and model setup."""
+        return hashlib.sha256(f"{self._cache_namespace(fast)}|{query}".encode()).hexdigest()
+    
+    def _answer_locally(self, query):
+        """
+        Answer simple lookup queries directly from the data.
+        
+        Args:
+            query (str): Natural language query
+            
+        Returns:
+            str: Response, or None if the query needs the LLM
+        """
+        query = query.strip()
+        for pattern, handler in self._INTENT_PATTERNS:
+            match = pattern.fullmatch(query)
+            if match:
+                return getattr(self, handler)(match)
+        return None
+    
+    def _symbol_field(self, match, field):
+        """Look up a field for the symbol captured by an intent pattern."""
+        symbol = match.group(1).upper()
+        row = self.sym_index.get(symbol)
+        if row is None or field not in row:
+            return symbol, None
+        return symbol, row[field]
+    
+    def _answer_price(self, match):
+        symbol, price = self._symbol_field(match, 'Price')
+        return None if price is None else f"The stock price of {symbol} is ${price:.2f}."
+    
+    def _answer_performance(self, match):
+        symbol, perf = self._symbol_field(match, 'Performance (%)')
+        return None if perf is None else f"The performance of {symbol} is {perf:.2f}%."
+    
+    def _answer_pe_ratio(self, match):
+        symbol, pe = self._symbol_field(match, 'P/E Ratio')
+        return None if pe is None else f"The P/E Ratio of {symbol} is {pe:.2f}."
+    
+    def _answer_market_cap(self, match):
+        symbol, cap = self._symbol_field(match, 'Market Cap (Billion)')
+        return None if cap is None else f"The market cap of {symbol} is ${cap:,.0f} billion."
+    
+    def _answer_highest_price(self, match):
+        highest = self.df.loc[self.df['Price'].idxmax()]
+        return f"The stock with the highest price is {highest['Stock Name']} ({highest['Stock Symbol']}) with a price of ${highest['Price']:.2f}."
+    
+    def _answer_average_price(self, match):
+        return f"The average stock price is ${self.df['Price'].mean():.2f}."
+    
+    def _answer_top_sector(self, match):
+        counts = self.df['Sector'].value_counts()
+        return f"The sector with the most stocks is {counts.idxmax()} with {counts.max()} stocks."
+    
+    def _lookup(self, query_hash, query, fast=False):
+        """Return a local or cached response for the query, or None on a miss."""
+        answer = self._answer_locally(query)
+        if answer is not None:
+            return answer
+        
+        cached = self.disk_cache.get(query_hash)
+        if cached is None:
+            cached = self.cache.get(query, namespace=self._cache_namespace(fast))
+            if cached is not None:
+                self.disk_cache.set(query_hash, cached, expire=SEMANTIC_CACHE_TTL)
+        return cached
+    
+    def _store(self, query_hash, query, response, fast=False):
+        """Store a fresh agent response in both caches."""
+        self.disk_cache.set(query_hash, response, expire=SEMANTIC_CACHE_TTL)
+        self.cache.add(query, response, namespace=self._cache_namespace(fast))
+    
+    def _cached_invoke(self, query_hash, query):
+        """
+        Invoke the agent unless the query has been answered before.
+        
+        Args:
+            query_hash (str): Key from _query_hash(query)
+            query (str): Natural language query
+            
+        Returns:
+            str: Agent response
+        """
+        cached = self._lookup(query_hash, query)
+        if cached is not None:
+            return cached
+        
+        response = self.agent.invoke(query)["output"]
+        self._store(query_hash, query, response)
+        return response
     
     def analyze(self, query):
         """
@@ -58,10 +264,10 @@ class StockAnalyzer:
             dict: Response from the agent
         """
         try:
-            response = self.agent.invoke(query)
+            response = self._cached_invoke(self._query_hash(query), query)
             return {
                 "query": query,
-                "response": response["output"]
+                "response": response
             }
         except Exception as e:
             return {
@@ -69,24 +275,216 @@ class StockAnalyzer:
                 "response": f"Error: {str(e)}"
             }
     
+    def analyze_stream(self, query):
+        """
+        Analyze stock data with a natural language query, streaming the answer.
+        
+        The agent's LLM tokens are streamed through astream_events on the shared
+        event loop; the reasoning steps are skipped and only the text after the
+        agent's "Final Answer:" marker is yielded.
+        
+        Args:
+            query (str): Natural language query
+            
+        Yields:
+            str: Chunks of the response as the model produces them
+        """
+        query_hash = self._query_hash(query)
+        cached = self._lookup(query_hash, query)
+        if cached is not None:
+            yield cached
+            return
+        
+        events = self.agent.astream_events(query, version="v2")
+        texts = {}
+        answers = {}
+        output = None
+        while True:
+            try:
+                event = _run_async(events.__anext__())
+            except StopAsyncIteration:
+                break
+            
+            if event["event"] == "on_chat_model_stream":
+                # Each agent step is its own LLM run; collect its text and
+                # stream whatever follows the final answer marker
+                run_id = event["run_id"]
+                text = texts[run_id] = texts.get(run_id, "") + event["data"]["chunk"].content
+                start = text.find(self._FINAL_ANSWER_MARKER)
+                if start < 0:
+                    continue
+                answer = text[start + len(self._FINAL_ANSWER_MARKER):].lstrip()
+                new_text = answer[len(answers.get(run_id, "")):]
+                if new_text:
+                    answers[run_id] = answer
+                    yield new_text
+            elif event["event"] == "on_chain_end" and event["name"] == "AgentExecutor":
+                output = event["data"]["output"]["output"]
+        
+        # Answers the agent returns without the marker were not streamed
+        if not answers and output:
+            yield output
+        
+        # An empty answer would be served from both caches until it expires
+        response = output or "".join(answers.values())
+        if response:
+            self._store(query_hash, query, response)
+    
+    async def _analyze_async(self, query, semaphore, fast=False):
+        """
+        Analyze a single query asynchronously.
+        
+        Args:
+            query (str): Natural language query
+            semaphore (asyncio.Semaphore): Limits the number of in-flight API calls
+            fast (bool): Run the query with the fast-model agent instead of self.agent
+            
+        Returns:
+            dict: Response from the agent
+        """
+        query_hash = self._query_hash(query, fast)
+        cached = self._lookup(query_hash, query, fast)
+        if cached is not None:
+            return {
+                "query": query,
+                "response": cached
+            }
+        
+        async with semaphore:
+            print(f"Running query: {query}")
+            response = await (self.fast_agent if fast else self.agent).ainvoke(query)
+            self._store(query_hash, query, response["output"], fast)
+            return {
+                "query": query,
+                "response": response["output"]
+            }
+    
+    async def _run_all(self, queries, fast=False):
+        """
+        Run all queries concurrently, capped at MAX_CONCURRENT_QUERIES.
+        
+        Args:
+            queries (list): List of query strings
+            fast (bool): Run the queries with the fast-model agent instead of self.agent
+            
+        Returns:
+            list: One result dict per query, in input order
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+        results = await asyncio.gather(
+            *[self._analyze_async(query, semaphore, fast) for query in queries],
+            return_exceptions=True
+        )
+        
+        # Failed queries come back as exceptions; report them like analyze() does
+        return [
+            {"query": query, "response": f"Error: {str(result)}"}
+            if isinstance(result, Exception) else result
+            for query, result in zip(queries, results)
+        ]
+    
+    async def _run_batch_async(self, queries, data_csv, semaphore):
+        """
+        Answer several queries with a single LLM call.
+        
+        The questions are numbered in one prompt that shares the data once,
+        and the model is asked to reply with a JSON array of answers.
+        
+        Args:
+            queries (list): List of query strings
+            data_csv (str): Stock data as CSV text
+            semaphore (asyncio.Semaphore): Limits the number of in-flight API calls
+            
+        Returns:
+            list: One result dict per query, in input order
+            
+        Raises:
+            ValueError: If the reply is not a JSON array with one answer per query
+        """
+        numbered = "\n".join(f"{i}) {query}" for i, query in enumerate(queries, 1))
+        prompt = (
+            f"Given this stock data in CSV format:\n{data_csv}\n"
+            f"Answer the following {len(queries)} questions. Reply with only a JSON array "
+            f"of {len(queries)} strings, one answer per question, in the same order:\n{numbered}"
+        )
+        
+        async with semaphore:
+            print(f"Running batch of {len(queries)} queries")
+            message = await self.fast_llm.ainvoke(prompt)
+        
+        # Models sometimes wrap JSON in a markdown code fence
+        content = message.content.strip().removeprefix("```json").strip("`").strip()
+        answers = json.loads(content)
+        if not isinstance(answers, list) or len(answers) != len(queries):
+            raise ValueError(f"Expected {len(queries)} answers, got: {content[:200]}")
+        
+        results = []
+        for query, answer in zip(queries, answers):
+            self._store(self._query_hash(query, fast=True), query, str(answer), fast=True)
+            results.append({"query": query, "response": str(answer)})
+        return results
+    
+    async def _run_batched(self, queries):
+        """
+        Run queries in batches of STANDARD_QUERY_BATCH_SIZE per call to the fast model.
+        
+        Cached answers are reused; a batch whose reply cannot be parsed
+        falls back to one fast-agent call per query.
+        
+        Args:
+            queries (list): List of query strings
+            
+        Returns:
+            list: One result dict per query, in input order
+        """
+        results = {}
+        misses = []
+        for query in queries:
+            cached = self._lookup(self._query_hash(query, fast=True), query, fast=True)
+            if cached is not None:
+                results[query] = {"query": query, "response": cached}
+            elif query not in misses:
+                misses.append(query)
+        
+        if misses:
+            batches = [
+                misses[i:i + STANDARD_QUERY_BATCH_SIZE]
+                for i in range(0, len(misses), STANDARD_QUERY_BATCH_SIZE)
+            ]
+            semaphore = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+            batch_results = await asyncio.gather(
+                *[self._run_batch_async(batch, self.data_csv, semaphore) for batch in batches],
+                return_exceptions=True
+            )
+            
+            fallback = []
+            for batch, batch_result in zip(batches, batch_results):
+                if isinstance(batch_result, Exception):
+                    print(f"Batch failed ({batch_result}), falling back to the agent")
+                    fallback.extend(batch)
+                else:
+                    results.update((result["query"], result) for result in batch_result)
+            
+            if fallback:
+                fallback_results = await self._run_all(fallback, fast=True)
+                results.update((result["query"], result) for result in fallback_results)
+        
+        return [results[query] for query in queries]
+    
     def run_standard_queries(self):
         """
-        Run standard predefined queries and return results.
+        Run standard predefined queries in batched calls to the fast model and return results.
         
         Returns:
             pandas.DataFrame: Results of standard queries
         """
-        results = []
-        for query in STANDARD_QUERIES:
-            print(f"Running query: {query}")
-            result = self.analyze(query)
-            results.append(result)
+        results = _run_async(self._run_batched(STANDARD_QUERIES))
         
         return pd.DataFrame(results)
     
     def run_custom_queries(self, queries):
         """
-        Run custom queries provided by the user.
+        Run custom queries provided by the user concurrently.
         
         Args:
             queries (list): List of query strings
@@ -94,10 +492,6 @@ class StockAnalyzer:
         Returns:
             pandas.DataFrame: Results of custom queries
         """
-        results = []
-        for query in queries:
-            print(f"Running query: {query}")
-            result = self.analyze(query)
-            results.append(result)
+        results = _run_async(self._run_all(list(queries)))
         
-        return pd.DataFrame(results) 
\ No newline at end of file
+        return pd.DataFrame(results)
\ No newline at end of file
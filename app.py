@@ -5,19 +5,17 @@ Provides an interactive UI for stock data analysis.
 
 import streamlit as st
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+import hashlib
+import numpy as np
+import plotly.graph_objects as go
+import plotly.io as pio
+import pyarrow as pa
 import os
-from config import GROQ_API_KEY
-from data_processor import load_stock_data, get_stock_statistics
-from visualizer import (
-    plot_sector_distribution,
-    plot_price_distribution,
-    plot_performance_by_sector,
-    plot_top_stocks_by_price
-)
-import io
-import sys
+import re
+import threading
+import weakref
+from config import MODEL_TEMPERATURE, get_groq_api_key
+from data_processor import load_stock_data, find_data_file, get_stock_statistics, get_top_stocks_by_price, build_symbol_index, get_price_histogram
 
 # Configure Streamlit page - MUST BE THE FIRST STREAMLIT COMMAND
 st.set_page_config(
@@ -32,6 +30,10 @@ st.set_page_config(
     }
 )
 
+# Pages and their navigation icons
+PAGE_OPTIONS = ["Dashboard", "AI Analysis", "Data Explorer", "About"]
+PAGE_ICONS = {"Dashboard": "📈", "AI Analysis": "🤖", "Data Explorer": "🔍", "About": "ℹ️"}
+
 # Initialize session state for page navigation
 if 'page' not in st.session_state:
     st.session_state.page = "Dashboard"
@@ -39,8 +41,11 @@ if 'page' not in st.session_state:
 # Debug information - only show in development mode
 debug_mode = False  # Set to True for debugging
 
-# Apply modern styling with dark theme
-st.markdown("""
+# Static page markup, kept as module constants so the strings are built once
+# per process instead of on every rerun. Streamlit clears any element that a
+# rerun does not emit again, so these are still written on each run; pure
+# HTML/CSS goes through st.html, which skips the markdown parser.
+APP_CSS = """
 <style>
     /* Main theme colors */
     :root {
@@ -97,6 +102,12 @@ st.markdown("""
         margin-bottom: 15px;
     }
     
+    .metric-grid {
+        display: grid;
+        grid-template-columns: repeat(auto-fit, minmax(180px, 1fr));
+        gap: 1rem;
+    }
+    
     .metric-card:hover {
         transform: translateY(-5px);
         box-shadow: 0 6px 18px rgba(0,0,0,0.3);
@@ -112,12 +123,13 @@ st.markdown("""
         margin: 1rem 0;
     }
     
-    /* Tabs styling */
+    /* Tabs styling (the tabs also serve as the dashboard's chart card) */
     .stTabs {
         background-color: var(--card-background);
         border-radius: 10px;
-        padding: 10px;
-        box-shadow: 0 2px 10px rgba(0,0,0,0.2);
+        padding: 20px;
+        margin-top: 20px;
+        box-shadow: 0 2px 12px rgba(0,0,0,0.2);
     }
     
     .stTabs [data-baseweb="tab-list"] {
@@ -170,6 +182,31 @@ st.markdown("""
         padding-top: 1rem;
     }
     
+    /* Sidebar navigation: radio options drawn as full-width pills */
+    [data-testid="stSidebar"] div[role="radiogroup"] {
+        gap: 10px;
+    }
+    
+    [data-testid="stSidebar"] div[role="radiogroup"] > label {
+        width: 100%;
+        margin: 0;
+        padding: 10px;
+        border-radius: 8px;
+        background-color: rgba(77, 166, 255, 0.05);
+        border: 1px solid rgba(77, 166, 255, 0.1);
+    }
+    
+    [data-testid="stSidebar"] div[role="radiogroup"] > label > div:first-child {
+        display: none;
+    }
+    
+    [data-testid="stSidebar"] div[role="radiogroup"] > label:has(input:checked) {
+        background-color: rgba(77, 166, 255, 0.2);
+        border-color: rgba(77, 166, 255, 0.3);
+        color: var(--primary-color);
+        font-weight: 600;
+    }
+    
     /* Slider and other widgets */
     .stSlider [data-baseweb="slider"] {
         margin-top: 0.5rem;
@@ -220,15 +257,6 @@ st.markdown("""
         color: var(--primary-color);
     }
     
-    /* Charts area */
-    .chart-container {
-        background-color: var(--card-background);
-        border-radius: 10px;
-        padding: 20px;
-        margin-top: 20px;
-        box-shadow: 0 2px 12px rgba(0,0,0,0.2);
-    }
-    
     /* Expander styling */
     .streamlit-expanderHeader {
         background-color: rgba(77, 166, 255, 0.1);
@@ -262,7 +290,110 @@ st.markdown("""
         fill: transparent !important;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+FOOTER_HTML = """
+<div class="footer">
+    <div>StockSense Analyzer © 2024 | Powered by <a href="https://streamlit.io" target="_blank">Streamlit</a> & <a href="https://groq.com" target="_blank">Groq AI</a></div>
+</div>
+"""
+
+SIDEBAR_HEADER_HTML = """
+<div style="display: flex; justify-content: center; margin-bottom: 20px;">
+    <div style="background-color: rgba(77, 166, 255, 0.1); padding: 20px; border-radius: 10px; text-align: center; width: 90%;">
+        <div style="background-color: #4DA6FF; width: 60px; height: 60px; border-radius: 12px; display: flex; justify-content: center; align-items: center; margin: 0 auto 15px auto; box-shadow: 0 3px 10px rgba(77, 166, 255, 0.3);">
+            <span style="font-size: 30px;">📊</span>
+        </div>
+        <h2 style="margin: 0; color: #4DA6FF; font-size: 1.5rem; font-weight: 600;">StockSense</h2>
+        <p style="margin: 5px 0 0 0; color: #9CA3AF; font-size: 0.9rem;">Intelligent Stock Analysis</p>
+    </div>
+</div>
+<div style="background-color: rgba(77, 166, 255, 0.05); padding: 10px 15px; border-radius: 8px; margin-bottom: 15px; border: 1px solid rgba(77, 166, 255, 0.1);">
+    <h3 style="margin: 0 0 10px 0; color: #4DA6FF; font-size: 1.2rem;">Navigation</h3>
+</div>
+"""
+
+SIDEBAR_FOOTER_HTML = """
+<div style="background-color: rgba(77, 166, 255, 0.05); padding: 15px; border-radius: 8px; margin-top: 70px; text-align: center;">
+    <p style="margin: 0; color: #9CA3AF; font-size: 0.8rem;">StockSense Analyzer v1.0</p>
+    <p style="margin: 5px 0 0 0; color: #9CA3AF; font-size: 0.8rem;">© 2024 All Rights Reserved</p>
+    <div style="margin-top: 10px; display: flex; justify-content: center; gap: 10px;">
+        <a href="https://github.com/dxtjain/StockSense-Analyzer" target="_blank" style="color: #4DA6FF; text-decoration: none; font-size: 0.9rem;">GitHub</a>
+        <span style="color: #4DA6FF;">|</span>
+        <a href="https://github.com/dxtjain/StockSense-Analyzer/issues" target="_blank" style="color: #4DA6FF; text-decoration: none; font-size: 0.9rem;">Support</a>
+    </div>
+</div>
+"""
+
+METRIC_GRID_HTML = '<div class="metric-grid">{cards}</div>'
+
+METRIC_CARD_HTML = """
+<div class="metric-card">
+    <h3 style="margin: 0; font-size: 1rem; color: #9CA3AF;">{label}</h3>
+    <p style="font-size: 2.2rem; font-weight: 700; margin: 10px 0; color: #4DA6FF;">{value}</p>
+</div>
+"""
+
+SUMMARY_CARD_HTML = """
+<div style="background-color: rgba(77, 166, 255, 0.1); padding: 10px; border-radius: 5px; text-align: center;">
+    <p style="margin: 0; color: #9CA3AF; font-size: 0.9rem;">{label}</p>
+    <p style="margin: 0; font-weight: 700; font-size: 1.5rem; color: #4DA6FF;">{value}</p>
+    <p style="margin: 0; color: #9CA3AF; font-size: 0.9rem;">{note}</p>
+</div>
+"""
+
+ABOUT_HTML = """
+<div style="background-color: #242E42; color: white; border-radius: 10px; padding: 30px; box-shadow: 0 4px 12px rgba(0,0,0,0.2); margin: 10px 0 30px 0;">
+<p style="font-size: 1.2rem; line-height: 1.6;">StockSense Analyzer is a professional stock market analysis platform designed to provide powerful insights through AI-powered natural language queries and interactive visualizations.</p>
+
+<h3 style="color: #4DA6FF; margin-top: 25px; font-size: 1.5rem;">Core Features</h3>
+<div style="margin-top: 20px;">
+    <div style="display: flex; align-items: center; margin-bottom: 15px;">
+        <div style="background-color: #4DA6FF; color: white; border-radius: 50%; width: 32px; height: 32px; display: inline-flex; align-items: center; justify-content: center; margin-right: 15px; font-weight: bold;">1</div>
+        <div style="flex: 1;"><strong style="color: #4DA6FF; font-size: 1.1rem;">Natural Language Queries:</strong><br>Ask questions about stock data in plain English</div>
+    </div>
+    <div style="display: flex; align-items: center; margin-bottom: 15px;">
+        <div style="background-color: #4DA6FF; color: white; border-radius: 50%; width: 32px; height: 32px; display: inline-flex; align-items: center; justify-content: center; margin-right: 15px; font-weight: bold;">2</div>
+        <div style="flex: 1;"><strong style="color: #4DA6FF; font-size: 1.1rem;">Data Visualization:</strong><br>Interactive charts and graphs for stock analysis</div>
+    </div>
+    <div style="display: flex; align-items: center; margin-bottom: 15px;">
+        <div style="background-color: #4DA6FF; color: white; border-radius: 50%; width: 32px; height: 32px; display: inline-flex; align-items: center; justify-content: center; margin-right: 15px; font-weight: bold;">3</div>
+        <div style="flex: 1;"><strong style="color: #4DA6FF; font-size: 1.1rem;">Real-time Analysis:</strong><br>Get immediate responses to your financial queries</div>
+    </div>
+    <div style="display: flex; align-items: center; margin-bottom: 15px;">
+        <div style="background-color: #4DA6FF; color: white; border-radius: 50%; width: 32px; height: 32px; display: inline-flex; align-items: center; justify-content: center; margin-right: 15px; font-weight: bold;">4</div>
+        <div style="flex: 1;"><strong style="color: #4DA6FF; font-size: 1.1rem;">Data Exploration:</strong><br>Filter and explore the underlying stock data</div>
+    </div>
+</div>
+
+<h3 style="color: #4DA6FF; margin-top: 30px; font-size: 1.5rem;">Technologies Used</h3>
+<div style="display: grid; grid-template-columns: repeat(auto-fill, minmax(180px, 1fr)); gap: 15px; margin-top: 20px;">
+    <div style="background-color: rgba(77, 166, 255, 0.2); padding: 15px; border-radius: 8px; text-align: center; border: 1px solid rgba(77, 166, 255, 0.3);">
+        <strong style="color: #4DA6FF; font-size: 1.1rem;">Python</strong><br><span style="color: #ccc;">Data Science & Web Stack</span>
+    </div>
+    <div style="background-color: rgba(77, 166, 255, 0.2); padding: 15px; border-radius: 8px; text-align: center; border: 1px solid rgba(77, 166, 255, 0.3);">
+        <strong style="color: #4DA6FF; font-size: 1.1rem;">LangChain</strong><br><span style="color: #ccc;">AI integration</span>
+    </div>
+    <div style="background-color: rgba(77, 166, 255, 0.2); padding: 15px; border-radius: 8px; text-align: center; border: 1px solid rgba(77, 166, 255, 0.3);">
+        <strong style="color: #4DA6FF; font-size: 1.1rem;">Groq LLM</strong><br><span style="color: #ccc;">Natural Language Processing</span>
+    </div>
+    <div style="background-color: rgba(77, 166, 255, 0.2); padding: 15px; border-radius: 8px; text-align: center; border: 1px solid rgba(77, 166, 255, 0.3);">
+        <strong style="color: #4DA6FF; font-size: 1.1rem;">Pandas</strong><br><span style="color: #ccc;">Data manipulation</span>
+    </div>
+    <div style="background-color: rgba(77, 166, 255, 0.2); padding: 15px; border-radius: 8px; text-align: center; border: 1px solid rgba(77, 166, 255, 0.3);">
+        <strong style="color: #4DA6FF; font-size: 1.1rem;">Plotly</strong><br><span style="color: #ccc;">Visualizations</span>
+    </div>
+    <div style="background-color: rgba(77, 166, 255, 0.2); padding: 15px; border-radius: 8px; text-align: center; border: 1px solid rgba(77, 166, 255, 0.3);">
+        <strong style="color: #4DA6FF; font-size: 1.1rem;">Streamlit</strong><br><span style="color: #ccc;">Web interface</span>
+    </div>
+</div>
+
+<p style="margin-top: 30px; font-style: italic; color: #ccc;">This platform is designed for investors, analysts, and financial professionals looking to gain rapid insights from stock market data using advanced AI.</p>
+</div>
+"""
+
+# Apply modern styling with dark theme
+st.html(APP_CSS)
 
 # App header with logo and title
 col1, col2 = st.columns([1, 5])
@@ -280,83 +411,336 @@ with col2:
 
 # Sidebar for navigation
 with st.sidebar:
-    st.markdown("""
-    <div style="display: flex; justify-content: center; margin-bottom: 20px;">
-        <div style="background-color: rgba(77, 166, 255, 0.1); padding: 20px; border-radius: 10px; text-align: center; width: 90%;">
-            <div style="background-color: #4DA6FF; width: 60px; height: 60px; border-radius: 12px; display: flex; justify-content: center; align-items: center; margin: 0 auto 15px auto; box-shadow: 0 3px 10px rgba(77, 166, 255, 0.3);">
-                <span style="font-size: 30px;">📊</span>
-            </div>
-            <h2 style="margin: 0; color: #4DA6FF; font-size: 1.5rem; font-weight: 600;">StockSense</h2>
-            <p style="margin: 5px 0 0 0; color: #9CA3AF; font-size: 0.9rem;">Intelligent Stock Analysis</p>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.html(SIDEBAR_HEADER_HTML)
     
-    st.markdown("""
-    <div style="background-color: rgba(77, 166, 255, 0.05); padding: 10px 15px; border-radius: 8px; margin-bottom: 15px; border: 1px solid rgba(77, 166, 255, 0.1);">
-        <h3 style="margin: 0 0 10px 0; color: #4DA6FF; font-size: 1.2rem;">Navigation</h3>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # Custom navigation buttons using session state
-    options = ["Dashboard", "AI Analysis", "Data Explorer", "About"]
-    icons = ["📈", "🤖", "🔍", "ℹ️"]
-    
-    # Function to change page
-    def change_page(new_page):
-        st.session_state.page = new_page
-    
-    for i, (option, icon) in enumerate(zip(options, icons)):
-        if option == st.session_state.page:
-            st.markdown(f"""
-            <div style="background-color: rgba(77, 166, 255, 0.2); padding: 10px; border-radius: 8px; margin-bottom: 10px; cursor: pointer; border: 1px solid rgba(77, 166, 255, 0.3);">
-                <div style="display: flex; align-items: center;">
-                    <div style="background-color: #4DA6FF; color: white; border-radius: 8px; width: 30px; height: 30px; display: flex; align-items: center; justify-content: center; margin-right: 10px;">
-                        <span>{icon}</span>
-                    </div>
-                    <span style="color: #4DA6FF; font-weight: 600;">{option}</span>
-                </div>
-            </div>
-            """, unsafe_allow_html=True)
-        else:
-            button_key = f"nav_button_{i}"
-            if st.button(f"{icon} {option}", key=button_key, use_container_width=True):
-                change_page(option)
+    # Page navigation, bound to st.session_state.page through the widget key
+    st.radio("Page", PAGE_OPTIONS, key="page", label_visibility="collapsed",
+             format_func=lambda option: f"{PAGE_ICONS[option]} {option}")
     
     # Add additional information at the bottom of the sidebar
-    st.markdown("<div style='margin-top: 50px;'></div>", unsafe_allow_html=True)
-    st.markdown("""
-    <div style="background-color: rgba(77, 166, 255, 0.05); padding: 15px; border-radius: 8px; margin-top: 20px; text-align: center;">
-        <p style="margin: 0; color: #9CA3AF; font-size: 0.8rem;">StockSense Analyzer v1.0</p>
-        <p style="margin: 5px 0 0 0; color: #9CA3AF; font-size: 0.8rem;">© 2024 All Rights Reserved</p>
-        <div style="margin-top: 10px; display: flex; justify-content: center; gap: 10px;">
-            <a href="https://github.com/dxtjain/StockSense-Analyzer" target="_blank" style="color: #4DA6FF; text-decoration: none; font-size: 0.9rem;">GitHub</a>
-            <span style="color: #4DA6FF;">|</span>
-            <a href="https://github.com/dxtjain/StockSense-Analyzer/issues" target="_blank" style="color: #4DA6FF; text-decoration: none; font-size: 0.9rem;">Support</a>
-        </div>
-    </div>
-    """, unsafe_allow_html=True)
+    st.html(SIDEBAR_FOOTER_HTML)
+
+# Bound the in-memory caches so entries don't pile up on long-running servers:
+# per-dataset results need only a few slots, per-filter-state results more
+DATASET_CACHE_ENTRIES = 8
+FILTER_CACHE_ENTRIES = 32
+
+# Hash DataFrames by content so cached results are rebuilt only when the data
+# changes. The key covers the rows in order plus the column labels and dtypes,
+# so reordered or relabelled frames do not share a cache entry. The shared
+# frame from get_shared_data is the same object on every rerun, so its hash is
+# remembered per object (checked through a weak reference, since ids are
+# reused once a frame is freed) and costs a dict lookup after the first call;
+# the cached functions therefore take that frame and slice it themselves.
+# Frames built anew on each rerun, like the Explorer's filtered slice, are
+# hashed in full every time. The memo is shared by every session's script
+# thread, so it is only read or changed while holding its lock.
+_FRAME_HASHES = {}
+_FRAME_HASHES_LOCK = threading.Lock()
+
+def hash_frame(df):
+    with _FRAME_HASHES_LOCK:
+        entry = _FRAME_HASHES.get(id(df))
+    if entry is not None and entry[0]() is df:
+        return entry[1]
+    
+    row_hashes = pd.util.hash_pandas_object(df).to_numpy()
+    layout = repr((list(df.columns), [str(dtype) for dtype in df.dtypes])).encode()
+    entry = (weakref.ref(df), hashlib.sha256(row_hashes.tobytes() + layout).hexdigest())
+    with _FRAME_HASHES_LOCK:
+        for key in [k for k, (ref, _) in _FRAME_HASHES.items() if ref() is None]:
+            del _FRAME_HASHES[key]
+        _FRAME_HASHES[id(df)] = entry
+    return entry[1]
+
+DF_HASH_FUNCS = {pd.DataFrame: hash_frame}
+
+# Render the dashboard metric cards once when the data is loaded, so reruns
+# emit a ready-made HTML block
+def add_display_strings(stats):
+    cards = [
+        ("Total Stocks", stats['total_stocks']),
+        ("Average Price", f"${stats['average_price']:.2f}"),
+        ("Highest Price", stats['highest_price']),
+        ("Avg Performance", f"{stats['avg_performance']:.2f}%")
+    ]
+    stats['metric_cards_html'] = METRIC_GRID_HTML.format(
+        cards="".join(METRIC_CARD_HTML.format(label=label, value=value) for label, value in cards)
+    )
+    return stats
+
+# Load stock data, persisted to disk so server restarts skip parsing. Persistent
+# caches ignore ttl, so the entry is keyed on the path and modification time of
+# the data file being loaded instead and reloads whenever that file changes.
+@st.cache_data(persist="disk", show_spinner=False, max_entries=DATASET_CACHE_ENTRIES)
+def load_cached_data(data_file, data_mtime):
+    df = load_stock_data(data_file)
+    stats = add_display_strings(get_stock_statistics(df))
+    return df, stats
+
+# Share one in-process copy of the loaded data across reruns and sessions.
+# cache_data hands out a fresh unpickled copy on every hit; cache_resource
+# returns the same object, which is safe because nothing mutates df or stats.
+@st.cache_resource(max_entries=DATASET_CACHE_ENTRIES)
+def get_shared_data(data_file, data_mtime):
+    return load_cached_data(data_file, data_mtime)
+
+# Sample data shown when the real data file cannot be loaded
+SAMPLE_DATA = {
+    'Stock Symbol': ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'TSLA'],
+    'Stock Name': ['Apple Inc.', 'Microsoft Corp.', 'Alphabet Inc.', 'Amazon.com Inc.', 'Tesla Inc.'],
+    'Price': [150.25, 290.50, 2800.75, 3250.50, 650.75],
+    'P/E Ratio': [28.5, 35.6, 30.2, 65.8, 120.5],
+    'Performance (%)': [12.5, 8.2, 15.7, 6.8, 5.0],
+    'Sector': ['Technology', 'Technology', 'Technology', 'Consumer Services', 'Automotive']
+}
+
+@st.cache_resource
+def get_sample_data():
+    df = pd.DataFrame(SAMPLE_DATA)
+    stats = add_display_strings(get_stock_statistics(df))
+    return df, stats
+
+# Path and modification time of the data file in use; everything loaded from
+# it is cached on this pair so it all reloads together when the file changes
+def get_data_version():
+    data_file = find_data_file()
+    data_mtime = os.path.getmtime(data_file) if data_file else None
+    return data_file, data_mtime
 
 # Load stock data (with caching for performance)
-@st.cache_data(ttl=3600)
 def get_cached_data():
     try:
-        df = load_stock_data()
-        stats = get_stock_statistics(df)
-        return df, stats
+        return get_shared_data(*get_data_version())
     except Exception as e:
-        # Create sample data as fallback
-        data = {
-            'Stock Symbol': ['AAPL', 'MSFT', 'GOOGL', 'AMZN', 'TSLA'],
-            'Stock Name': ['Apple Inc.', 'Microsoft Corp.', 'Alphabet Inc.', 'Amazon.com Inc.', 'Tesla Inc.'],
-            'Price': [150.25, 290.50, 2800.75, 3250.50, 650.75],
-            'P/E Ratio': [28.5, 35.6, 30.2, 65.8, 120.5],
-            'Performance (%)': [12.5, 8.2, 15.7, 6.8, 5.0],
-            'Sector': ['Technology', 'Technology', 'Technology', 'Consumer Services', 'Automotive']
-        }
-        df = pd.DataFrame(data)
-        stats = get_stock_statistics(df)
-        return df, stats
+        # Fall back to sample data
+        return get_sample_data()
+
+# Filter widget options and slider bounds for the Data Explorer (computed once per dataset)
+@st.cache_data(hash_funcs=DF_HASH_FUNCS, max_entries=DATASET_CACHE_ENTRIES)
+def get_filter_bounds(df):
+    bounds = {
+        'sectors': ["All"] + sorted(df["Sector"].unique().tolist()),
+        'price': (float(df["Price"].min()), float(df["Price"].max()))
+    }
+    if 'P/E Ratio' in df.columns:
+        bounds['pe'] = (float(df["P/E Ratio"].min()), float(df["P/E Ratio"].max()))
+    if 'Performance (%)' in df.columns:
+        bounds['perf'] = (float(df["Performance (%)"].min()), float(df["Performance (%)"].max()))
+    return bounds
+
+# Per-filter boolean masks, each cached on its own filter value so moving one
+# filter reuses the masks of the others
+@st.cache_data(hash_funcs=DF_HASH_FUNCS, max_entries=FILTER_CACHE_ENTRIES)
+def get_sector_mask(df, selected_sector):
+    return np.asarray(df["Sector"].values == selected_sector)
+
+@st.cache_data(hash_funcs=DF_HASH_FUNCS, max_entries=FILTER_CACHE_ENTRIES)
+def get_range_mask(df, column, value_range):
+    values = df[column].values
+    return (values >= value_range[0]) & (values <= value_range[1])
+
+# Filter stock data for the Data Explorer and summarize the result (cached per filter state)
+@st.cache_data(hash_funcs=DF_HASH_FUNCS, max_entries=FILTER_CACHE_ENTRIES)
+def get_filtered_data(df, selected_sector, price_range, pe_range=None, perf_range=None):
+    # Combine the per-filter NumPy masks and slice once; no copy of the full
+    # frame is made since filtered_df is only read downstream
+    mask = get_range_mask(df, "Price", price_range)
+    
+    if selected_sector != "All":
+        mask = mask & get_sector_mask(df, selected_sector)
+    
+    if pe_range is not None:
+        mask = mask & get_range_mask(df, "P/E Ratio", pe_range)
+        
+    if perf_range is not None:
+        mask = mask & get_range_mask(df, "Performance (%)", perf_range)
+    
+    filtered_df = df.iloc[mask]
+    
+    # Summary figures for the mini-dashboard, cached alongside the slice
+    summary = {
+        'count': len(filtered_df),
+        'avg_price': filtered_df['Price'].mean() if not filtered_df.empty else 0,
+        'avg_perf': filtered_df['Performance (%)'].mean() if 'Performance (%)' in filtered_df.columns and not filtered_df.empty else 0
+    }
+    
+    return filtered_df, summary
+
+# Convert data to an Arrow table once so st.dataframe can ship it as-is
+@st.cache_data(hash_funcs=DF_HASH_FUNCS, max_entries=FILTER_CACHE_ENTRIES)
+def get_arrow_table(df):
+    return pa.Table.from_pandas(df, preserve_index=False)
+
+# Number formats for the Data Explorer table, applied by the frontend rather
+# than by a pandas Styler on the server
+EXPLORER_COLUMN_CONFIG = {
+    "Price": st.column_config.NumberColumn("Price ($)", format="$%.2f"),
+    "Performance (%)": st.column_config.NumberColumn("Performance (%)", format="%.2f%%"),
+    "P/E Ratio": st.column_config.NumberColumn("P/E Ratio", format="%.2f")
+}
+
+# Encode data as CSV bytes for download (cached per filtered frame)
+@st.cache_data(hash_funcs=DF_HASH_FUNCS, max_entries=FILTER_CACHE_ENTRIES)
+def get_csv_bytes(df):
+    return df.to_csv(index=False).encode('utf-8')
+
+# Index stock data by symbol for O(1) lookups in the AI Analysis page
+@st.cache_data(hash_funcs=DF_HASH_FUNCS, max_entries=DATASET_CACHE_ENTRIES)
+def get_symbol_index(df):
+    return build_symbol_index(df, ['Stock Name', 'Price', 'Performance (%)', 'P/E Ratio'])
+
+# Highest-priced stocks for the dashboard chart, sorted once per dataset
+@st.cache_data(hash_funcs=DF_HASH_FUNCS, max_entries=DATASET_CACHE_ENTRIES)
+def get_top_stocks(df, n=10):
+    return get_top_stocks_by_price(df, n)
+
+# Dashboard charts: each figure is cached on its own input data
+CHART_COLORS = ['#4DA6FF', '#FF9F1C', '#4CAF50', '#F44336', '#9C27B0', '#3F51B5', 
+                '#00BCD4', '#FFEB3B', '#FF5722', '#795548']
+
+# Register the dashboard's Plotly theme once per process; every figure picks
+# it up as the default template instead of restyling itself
+@st.cache_resource
+def init_plotly_theme():
+    template = go.layout.Template(pio.templates['plotly_dark'])
+    template.layout.paper_bgcolor = '#242E42'
+    template.layout.plot_bgcolor = '#242E42'
+    template.layout.colorway = CHART_COLORS
+    pio.templates['stocksense'] = template
+    pio.templates.default = 'stocksense'
+    return True
+
+init_plotly_theme()
+
+@st.cache_data(show_spinner=False, max_entries=DATASET_CACHE_ENTRIES)
+def create_sector_figure(sector_counts):
+    import plotly.express as px
+    fig1 = px.pie(
+        names=sector_counts.index, 
+        values=sector_counts.values, 
+        title='Stock Distribution by Sector'
+    )
+    fig1.update_traces(textinfo='percent', marker_line_color='#242E42', marker_line_width=1)
+    fig1.update_layout(legend_title_text='Sectors')
+    return fig1
+
+@st.cache_data(hash_funcs=DF_HASH_FUNCS, show_spinner=False, max_entries=DATASET_CACHE_ENTRIES)
+def create_price_figure(df):
+    # Bin the prices here so the figure carries 20 bars instead of every raw price
+    counts, edges = get_price_histogram(df, bins=20)
+    fig2 = go.Figure(go.Bar(
+        x=(edges[:-1] + edges[1:]) / 2,
+        y=counts,
+        width=np.diff(edges),
+        marker_color='#4DA6FF',
+        marker_line_color='#242E42',
+        marker_line_width=1,
+        hovertemplate='Price ($): %{x:$,.2f}<br>Count: %{y}<extra></extra>'
+    ))
+    fig2.update_layout(title='Distribution of Stock Prices', xaxis_title='Price ($)', yaxis_title='Count', bargap=0)
+    return fig2
+
+@st.cache_data(hash_funcs=DF_HASH_FUNCS, show_spinner=False, max_entries=DATASET_CACHE_ENTRIES)
+def create_performance_figure(df):
+    # Summarize each sector here so the figure carries five numbers per box
+    # instead of every raw performance value; whiskers reach the furthest
+    # values within 1.5 IQR of the box, as Plotly draws them, and the values
+    # beyond the whiskers are drawn as outlier points
+    fig3 = go.Figure()
+    groups = df.groupby('Sector', observed=True)['Performance (%)']
+    for i, (sector, values) in enumerate(groups):
+        values = values.dropna()
+        if values.empty:
+            continue
+        color = CHART_COLORS[i % len(CHART_COLORS)]
+        q1, median, q3 = values.quantile([0.25, 0.5, 0.75])
+        iqr = q3 - q1
+        within = values.between(q1 - 1.5 * iqr, q3 + 1.5 * iqr)
+        inside = values[within]
+        fig3.add_trace(go.Box(
+            name=sector,
+            x=[sector],
+            q1=[q1],
+            median=[median],
+            q3=[q3],
+            lowerfence=[inside.min()],
+            upperfence=[inside.max()],
+            marker_color=color
+        ))
+        outliers = values[~within]
+        if not outliers.empty:
+            fig3.add_trace(go.Scatter(
+                name=sector,
+                x=[sector] * len(outliers),
+                y=outliers.to_numpy(),
+                mode='markers',
+                marker_color=color,
+                hovertemplate='%{x}<br>Performance (%): %{y:.2f}<extra></extra>'
+            ))
+    fig3.update_layout(title='Stock Performance by Sector', xaxis_title='Sector', yaxis_title='Performance (%)',
+                       showlegend=False, xaxis_tickangle=-45)
+    return fig3
+
+@st.cache_data(hash_funcs=DF_HASH_FUNCS, show_spinner=False, max_entries=DATASET_CACHE_ENTRIES)
+def create_top_stocks_figure(df):
+    import plotly.express as px
+    top_n = get_top_stocks(df)[['Stock Symbol', 'Price']]
+    fig4 = px.bar(
+        top_n, 
+        x='Stock Symbol', 
+        y='Price', 
+        color='Stock Symbol', 
+        text_auto='$,.0f',  # Value labels on top of bars
+        title=f'Top {len(top_n)} Stocks by Price',
+        labels={'Price': 'Price ($)'}
+    )
+    fig4.update_traces(textposition='outside')
+    fig4.update_layout(showlegend=False, xaxis_tickangle=-45)
+    return fig4
+
+# Example queries and answers shown in demo mode
+@st.cache_data(hash_funcs=DF_HASH_FUNCS, max_entries=DATASET_CACHE_ENTRIES)
+def build_examples(df, highest):
+    sym_index = get_symbol_index(df)
+    return [
+        ("What is the stock price of AAPL?", f"The stock price of AAPL is ${sym_index['AAPL']['Price']:.2f}."),
+        ("What is the performance of TSLA?", f"The performance of TSLA is {sym_index['TSLA']['Performance (%)']:.2f}%."),
+        ("What is the PE ratio of MSFT?", f"The P/E Ratio of MSFT is {sym_index['MSFT']['P/E Ratio']:.2f}."),
+        ("Which stock has the highest price?", f"The stock with the highest price is {highest['Stock Name']} ({highest['Stock Symbol']}) with a price of ${highest['Price']:.2f}.")
+    ]
+
+# Demo-mode query dispatch: patterns are compiled once and tried in order,
+# each handler answers from the cached lookups
+DEMO_QUERY_HANDLERS = [
+    (re.compile(r'(?=.*AAPL)(?=.*(?i:price))', re.S),
+     lambda sym_index, stats: f"The stock price of AAPL is ${sym_index['AAPL']['Price']:.2f}"),
+    (re.compile(r'(?=.*TSLA)(?=.*(?i:performance))', re.S),
+     lambda sym_index, stats: f"The performance of TSLA is {sym_index['TSLA']['Performance (%)']:.2f}%"),
+    (re.compile(r'(?=.*MSFT)(?=.*PE)', re.S),
+     lambda sym_index, stats: f"The P/E Ratio of MSFT is {sym_index['MSFT']['P/E Ratio']:.2f}"),
+    (re.compile(r'(?=.*highest price)', re.S | re.I),
+     lambda sym_index, stats: f"The stock with the highest price is {stats['highest_price_stock']['Stock Name']} ({stats['highest_price']}) with a price of ${stats['highest_price_stock']['Price']:.2f}"),
+    (re.compile(r'(?=.*average)(?=.*price)', re.S | re.I),
+     lambda sym_index, stats: f"The average stock price is ${stats['average_price']:.2f}"),
+    (re.compile(r'(?=.*sector)(?=.*most)', re.S | re.I),
+     lambda sym_index, stats: f"The sector with the most stocks is {stats['top_sector']} with {stats['top_sector_count']} stocks"),
+]
+
+DEMO_FALLBACK_RESPONSE = "I don't have enough information to answer that specific question in demo mode. With the Groq API key configured, this would provide a detailed analysis."
+
+def answer_demo_query(query, sym_index, stats):
+    for pattern, handler in DEMO_QUERY_HANDLERS:
+        if pattern.match(query):
+            return handler(sym_index, stats)
+    return DEMO_FALLBACK_RESPONSE
+
+# Build the LLM-backed analyzer once per data file version (agent + Groq client
+# are expensive); data_mtime is only part of the cache key
+@st.cache_resource(max_entries=DATASET_CACHE_ENTRIES)
+def get_analyzer(data_file, data_mtime, api_key, temperature):
+    from analyzer import StockAnalyzer
+    return StockAnalyzer(data_file=data_file, api_key=api_key, temperature=temperature)
 
 # Get data with error handling
 try:
@@ -367,177 +751,37 @@ except Exception as e:
     st.stop()
 
 # Dashboard page
-if st.session_state.page == "Dashboard":
+def render_dashboard(df, stats):
     st.markdown("<h2 class='sub-header'>Market Overview</h2>", unsafe_allow_html=True)
     
     # Key metrics in columns with improved styling
     metrics_container = st.container()
     with metrics_container:
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            st.markdown("""
-            <div class="metric-card">
-                <h3 style="margin: 0; font-size: 1rem; color: #9CA3AF;">Total Stocks</h3>
-                <p style="font-size: 2.2rem; font-weight: 700; margin: 10px 0; color: #4DA6FF;">{}</p>
-            </div>
-            """.format(stats['total_stocks']), unsafe_allow_html=True)
-            
-        with col2:
-            st.markdown("""
-            <div class="metric-card">
-                <h3 style="margin: 0; font-size: 1rem; color: #9CA3AF;">Average Price</h3>
-                <p style="font-size: 2.2rem; font-weight: 700; margin: 10px 0; color: #4DA6FF;">${:.2f}</p>
-            </div>
-            """.format(stats['average_price']), unsafe_allow_html=True)
-            
-        with col3:
-            st.markdown("""
-            <div class="metric-card">
-                <h3 style="margin: 0; font-size: 1rem; color: #9CA3AF;">Highest Price</h3>
-                <p style="font-size: 2.2rem; font-weight: 700; margin: 10px 0; color: #4DA6FF;">{}</p>
-            </div>
-            """.format(stats['highest_price']), unsafe_allow_html=True)
-            
-        with col4:
-            st.markdown("""
-            <div class="metric-card">
-                <h3 style="margin: 0; font-size: 1rem; color: #9CA3AF;">Avg Performance</h3>
-                <p style="font-size: 2.2rem; font-weight: 700; margin: 10px 0; color: #4DA6FF;">{:.2f}%</p>
-            </div>
-            """.format(stats['avg_performance']), unsafe_allow_html=True)
+        st.html(stats['metric_cards_html'])
     
     # Visualizations with dark mode compatible styling
     st.markdown("<h3 class='sub-header' style='margin-top: 2rem;'>Market Visualizations</h3>", unsafe_allow_html=True)
     
-    # Create a background container for the visualization tabs
-    st.markdown('<div class="chart-container">', unsafe_allow_html=True)
-    
-    # Use caching for visualizations to improve performance
-    @st.cache_data
-    def create_visualizations():
-        # Set a dark theme for visualizations
-        plt.style.use('dark_background')
-        
-        # Custom colors for charts
-        colors = ['#4DA6FF', '#FF9F1C', '#4CAF50', '#F44336', '#9C27B0', '#3F51B5', 
-                 '#00BCD4', '#FFEB3B', '#FF5722', '#795548']
-        
-        # Create figures
-        fig1, ax1 = plt.subplots(figsize=(10, 6), facecolor='#242E42')
-        ax1.set_facecolor('#242E42')
-        sector_counts = df['Sector'].value_counts()
-        wedges, texts, autotexts = ax1.pie(
-            sector_counts, 
-            labels=None,  # We'll add a legend instead
-            autopct='%1.1f%%', 
-            startangle=90, 
-            shadow=False, 
-            colors=colors,
-            wedgeprops={'edgecolor': '#242E42', 'linewidth': 1, 'antialiased': True},
-            textprops={'color': 'white', 'fontsize': 12, 'fontweight': 'bold'}
-        )
-        # Enhance the appearance of percentage text
-        for autotext in autotexts:
-            autotext.set_fontsize(10)
-            autotext.set_fontweight('bold')
-        
-        # Add a legend
-        ax1.legend(
-            wedges, 
-            sector_counts.index, 
-            title="Sectors", 
-            loc="center left", 
-            bbox_to_anchor=(1, 0, 0.5, 1),
-            fontsize=10
-        )
-        
-        ax1.axis('equal')
-        ax1.set_title('Stock Distribution by Sector', fontsize=16, color='white', pad=20)
-        plt.tight_layout()
-        
-        # Second chart - price distribution
-        fig2, ax2 = plt.subplots(figsize=(10, 6), facecolor='#242E42')
-        ax2.set_facecolor('#242E42')
-        sns.histplot(df['Price'], bins=20, kde=True, ax=ax2, color='#4DA6FF', edgecolor='#242E42', line_kws={'color': '#FF9F1C', 'lw': 2})
-        plt.title('Distribution of Stock Prices', fontsize=16, color='white', pad=20)
-        plt.xlabel('Price ($)', fontsize=12, color='white')
-        plt.ylabel('Count', fontsize=12, color='white')
-        plt.grid(alpha=0.2)
-        ax2.tick_params(colors='white')
-        for spine in ax2.spines.values():
-            spine.set_color('#555555')
-        plt.tight_layout()
-        
-        # Third chart - performance by sector
-        fig3, ax3 = plt.subplots(figsize=(12, 8), facecolor='#242E42')
-        ax3.set_facecolor('#242E42')
-        box = sns.boxplot(x='Sector', y='Performance (%)', data=df, ax=ax3, palette=colors)
-        plt.xticks(rotation=45, ha='right', fontsize=10, color='white')
-        plt.title('Stock Performance by Sector', fontsize=16, color='white', pad=20)
-        plt.xlabel('Sector', fontsize=12, color='white')
-        plt.ylabel('Performance (%)', fontsize=12, color='white')
-        plt.grid(axis='y', alpha=0.2)
-        ax3.tick_params(colors='white')
-        for spine in ax3.spines.values():
-            spine.set_color('#555555')
-        plt.tight_layout()
-        
-        # Fourth chart - top stocks by price
-        fig4, ax4 = plt.subplots(figsize=(10, 6), facecolor='#242E42')
-        ax4.set_facecolor('#242E42')
-        top_n = df.nlargest(10, 'Price')
-        bars = sns.barplot(x='Stock Symbol', y='Price', data=top_n, ax=ax4, palette=colors)
-        plt.title('Top 10 Stocks by Price', fontsize=16, color='white', pad=20)
-        plt.xticks(rotation=45, ha='right', fontsize=10, color='white')
-        plt.xlabel('Stock Symbol', fontsize=12, color='white')
-        plt.ylabel('Price ($)', fontsize=12, color='white')
-        plt.grid(axis='y', alpha=0.2)
-        ax4.tick_params(colors='white')
-        for spine in ax4.spines.values():
-            spine.set_color('#555555')
-            
-        # Add value labels on top of bars
-        for i, bar in enumerate(bars.patches):
-            bars.annotate(
-                f'${bar.get_height():,.0f}',
-                (bar.get_x() + bar.get_width() / 2, bar.get_height()),
-                ha='center', 
-                va='bottom', 
-                fontsize=9,
-                color='white',
-                fontweight='bold',
-                xytext=(0, 5),  # 5 points vertical offset
-                textcoords='offset points'
-            )
-        
-        plt.tight_layout()
-        
-        return fig1, fig2, fig3, fig4
-    
     # Display tabs with visualizations
     viz_tab1, viz_tab2, viz_tab3, viz_tab4 = st.tabs(["Sector Distribution", "Price Distribution", "Performance by Sector", "Top Stocks"])
     
-    # Get cached visualizations
-    fig1, fig2, fig3, fig4 = create_visualizations()
-    
+    # Each tab builds (or fetches from cache) only its own figure; the figures
+    # take the shared frame so its memoized hash is reused for the cache key
     with viz_tab1:
-        st.pyplot(fig1)
+        st.plotly_chart(create_sector_figure(pd.Series(stats['sectors'])), use_container_width=True, theme=None)
     
     with viz_tab2:
-        st.pyplot(fig2)
+        st.plotly_chart(create_price_figure(df), use_container_width=True, theme=None)
     
     with viz_tab3:
-        st.pyplot(fig3)
+        st.plotly_chart(create_performance_figure(df), use_container_width=True, theme=None)
     
     with viz_tab4:
-        st.pyplot(fig4)
-        
-    # Close the chart container div
-    st.markdown('</div>', unsafe_allow_html=True)
+        st.plotly_chart(create_top_stocks_figure(df), use_container_width=True, theme=None)
 
-# AI Analysis page
-elif st.session_state.page == "AI Analysis":
+# AI Analysis page (a fragment, so submitting a query reruns only this page)
+@st.fragment
+def render_ai_analysis(df, stats):
     st.markdown("<h2 class='sub-header'>AI-Powered Stock Analysis</h2>", unsafe_allow_html=True)
     st.markdown("""
     <div class="highlight" style="background-color: rgba(77, 166, 255, 0.1); border-left: 4px solid #4DA6FF;">
@@ -546,8 +790,18 @@ elif st.session_state.page == "AI Analysis":
     </div>
     """, unsafe_allow_html=True)
     
+    # Precomputed lookups for the demo-mode answers
+    sym_index = get_symbol_index(df)
+    
     # Check if API key is available
-    api_missing = GROQ_API_KEY is None
+    api_key = get_groq_api_key()
+    api_missing = api_key is None
+    if not api_missing:
+        try:
+            analyzer = get_analyzer(*get_data_version(), api_key, MODEL_TEMPERATURE)
+        except Exception as e:
+            st.error(f"Error initializing AI analyzer: {e}")
+            api_missing = True
     if api_missing:
         st.warning("⚠️ Groq API key is not configured. Running in demo mode.")
         st.info("ℹ️ To enable full AI features, set GROQ_API_KEY in Streamlit secrets.")
@@ -556,14 +810,7 @@ elif st.session_state.page == "AI Analysis":
         with st.expander("Example Queries & Responses", expanded=True):
             st.markdown("<h4 style='color: #4DA6FF;'>Sample Queries and Results</h4>", unsafe_allow_html=True)
             
-            examples = [
-                ("What is the stock price of AAPL?", f"The stock price of AAPL is ${df[df['Stock Symbol'] == 'AAPL']['Price'].values[0]:.2f}."),
-                ("What is the performance of TSLA?", f"The performance of TSLA is {df[df['Stock Symbol'] == 'TSLA']['Performance (%)'].values[0]:.2f}%."),
-                ("What is the PE ratio of MSFT?", f"The P/E Ratio of MSFT is {df[df['Stock Symbol'] == 'MSFT']['P/E Ratio'].values[0]:.2f}."),
-                ("Which stock has the highest price?", f"The stock with the highest price is {df.loc[df['Price'].idxmax()]['Stock Name']} ({df.loc[df['Price'].idxmax()]['Stock Symbol']}) with a price of ${df['Price'].max():.2f}.")
-            ]
-            
-            for i, (question, answer) in enumerate(examples):
+            for i, (question, answer) in enumerate(build_examples(df, stats['highest_price_stock'])):
                 st.markdown(f"""
                 <div style="background-color: rgba(77, 166, 255, 0.05); padding: 10px; border-radius: 5px; margin-bottom: 10px;">
                     <strong style="color: #4DA6FF;">Q: {question}</strong>
@@ -587,32 +834,26 @@ elif st.session_state.page == "AI Analysis":
         pass
     
     if analyze_button:
-        if query:
+        if query and not api_missing:
+            # Stream the AI response; the spinner covers the agent's reasoning steps
+            st.markdown("""
+            <div style="display: flex; align-items: center; margin-bottom: 15px;">
+                <div style="background-color: #4DA6FF; color: white; border-radius: 50%; width: 28px; height: 28px; display: inline-flex; align-items: center; justify-content: center; margin-right: 10px;">
+                    <span style="font-size: 14px;">❓</span>
+                </div>
+                <div style="font-weight: 600; color: #E2E8F0;">{}</div>
+            </div>
+            """.format(query), unsafe_allow_html=True)
+            with st.spinner("Analyzing stock data..."):
+                try:
+                    st.write_stream(analyzer.analyze_stream(query))
+                except Exception as e:
+                    st.error(f"Error analyzing data: {e}")
+        elif query:
             with st.spinner("Analyzing stock data..."):
                 try:
                     # In this demo mode, process basic queries directly
-                    if "AAPL" in query and "price" in query.lower():
-                        aapl_price = df[df['Stock Symbol'] == 'AAPL']['Price'].values[0]
-                        response = f"The stock price of AAPL is ${aapl_price:.2f}"
-                    elif "TSLA" in query and "performance" in query.lower():
-                        tsla_perf = df[df['Stock Symbol'] == 'TSLA']['Performance (%)'].values[0]
-                        response = f"The performance of TSLA is {tsla_perf:.2f}%"
-                    elif "MSFT" in query and "PE" in query:
-                        msft_pe = df[df['Stock Symbol'] == 'MSFT']['P/E Ratio'].values[0]
-                        response = f"The P/E Ratio of MSFT is {msft_pe:.2f}"
-                    elif "highest price" in query.lower():
-                        highest = df.loc[df['Price'].idxmax()]
-                        response = f"The stock with the highest price is {highest['Stock Name']} ({highest['Stock Symbol']}) with a price of ${highest['Price']:.2f}"
-                    elif "average" in query.lower() and "price" in query.lower():
-                        avg_price = df['Price'].mean()
-                        response = f"The average stock price is ${avg_price:.2f}"
-                    # Add more basic query patterns
-                    elif "sector" in query.lower() and "most" in query.lower():
-                        top_sector = df['Sector'].value_counts().idxmax()
-                        count = df['Sector'].value_counts().max()
-                        response = f"The sector with the most stocks is {top_sector} with {count} stocks"
-                    else:
-                        response = "I don't have enough information to answer that specific question in demo mode. With the Groq API key configured, this would provide a detailed analysis."
+                    response = answer_demo_query(query, sym_index, stats)
                     
                     # Display response in a nice card
                     st.markdown("""
@@ -638,8 +879,9 @@ elif st.session_state.page == "AI Analysis":
         else:
             st.warning("Please enter a query to analyze.")
 
-# Data Explorer page
-elif st.session_state.page == "Data Explorer":
+# Data Explorer page (a fragment, so filter widgets rerun only this page)
+@st.fragment
+def render_data_explorer(df):
     st.markdown("<h2 class='sub-header'>Stock Data Explorer</h2>", unsafe_allow_html=True)
     
     # Create a clean container for the explorer
@@ -665,12 +907,14 @@ elif st.session_state.page == "Data Explorer":
         # Create a card for filters
         st.markdown('<div class="metric-card" style="padding: 15px;">', unsafe_allow_html=True)
         
+        bounds = get_filter_bounds(df)
+        
         # Filter by sector
-        sectors = ["All"] + sorted(df["Sector"].unique().tolist())
+        sectors = bounds['sectors']
         selected_sector = st.selectbox("Sector", sectors)
         
         # Price range slider
-        min_price, max_price = float(df["Price"].min()), float(df["Price"].max())
+        min_price, max_price = bounds['price']
         price_range = st.slider("Price Range ($)", 
                                min_price, max_price, 
                                (min_price, max_price),
@@ -680,8 +924,7 @@ elif st.session_state.page == "Data Explorer":
         if 'P/E Ratio' in df.columns:
             show_pe_filter = st.checkbox("Filter by P/E Ratio", value=False)
             if show_pe_filter:
-                pe_min = float(df["P/E Ratio"].min())
-                pe_max = float(df["P/E Ratio"].max())
+                pe_min, pe_max = bounds['pe']
                 pe_range = st.slider("P/E Ratio Range", 
                                    pe_min, pe_max, 
                                    (pe_min, pe_max))
@@ -689,8 +932,7 @@ elif st.session_state.page == "Data Explorer":
         if 'Performance (%)' in df.columns:
             show_perf_filter = st.checkbox("Filter by Performance", value=False)
             if show_perf_filter:
-                perf_min = float(df["Performance (%)"].min())
-                perf_max = float(df["Performance (%)"].max())
+                perf_min, perf_max = bounds['perf']
                 perf_range = st.slider("Performance Range (%)", 
                                       perf_min, perf_max, 
                                       (perf_min, perf_max))
@@ -699,7 +941,7 @@ elif st.session_state.page == "Data Explorer":
         
         # Add a reset filters button
         if st.button("Reset Filters", type="secondary", use_container_width=True):
-            st.experimental_rerun()
+            st.rerun()
             
     with data_col:
         # Create a header card for the data section
@@ -709,53 +951,24 @@ elif st.session_state.page == "Data Explorer":
         </div>
         """, unsafe_allow_html=True)
         
-        # Apply filters
-        filtered_df = df.copy()
-        
-        if selected_sector != "All":
-            filtered_df = filtered_df[filtered_df["Sector"] == selected_sector]
-            
-        filtered_df = filtered_df[(filtered_df["Price"] >= price_range[0]) & 
-                                 (filtered_df["Price"] <= price_range[1])]
-        
-        if 'P/E Ratio' in df.columns and show_pe_filter:
-            filtered_df = filtered_df[(filtered_df["P/E Ratio"] >= pe_range[0]) & 
-                                     (filtered_df["P/E Ratio"] <= pe_range[1])]
-            
-        if 'Performance (%)' in df.columns and show_perf_filter:
-            filtered_df = filtered_df[(filtered_df["Performance (%)"] >= perf_range[0]) & 
-                                     (filtered_df["Performance (%)"] <= perf_range[1])]
+        # Apply filters (cached per filter state)
+        filtered_df, summary = get_filtered_data(
+            df,
+            selected_sector,
+            price_range,
+            pe_range if 'P/E Ratio' in df.columns and show_pe_filter else None,
+            perf_range if 'Performance (%)' in df.columns and show_perf_filter else None
+        )
         
         # Add a mini-dashboard with key stats about the filtered data
-        col1, col2, col3 = st.columns(3)
-        with col1:
-            st.markdown(f"""
-            <div style="background-color: rgba(77, 166, 255, 0.1); padding: 10px; border-radius: 5px; text-align: center;">
-                <p style="margin: 0; color: #9CA3AF; font-size: 0.9rem;">Showing</p>
-                <p style="margin: 0; font-weight: 700; font-size: 1.5rem; color: #4DA6FF;">{len(filtered_df)}</p>
-                <p style="margin: 0; color: #9CA3AF; font-size: 0.9rem;">of {len(df)} stocks</p>
-            </div>
-            """, unsafe_allow_html=True)
-        
-        with col2:
-            avg_price = filtered_df['Price'].mean() if not filtered_df.empty else 0
-            st.markdown(f"""
-            <div style="background-color: rgba(77, 166, 255, 0.1); padding: 10px; border-radius: 5px; text-align: center;">
-                <p style="margin: 0; color: #9CA3AF; font-size: 0.9rem;">Avg Price</p>
-                <p style="margin: 0; font-weight: 700; font-size: 1.5rem; color: #4DA6FF;">${avg_price:.2f}</p>
-                <p style="margin: 0; color: #9CA3AF; font-size: 0.9rem;">in filtered data</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-        with col3:
-            avg_perf = filtered_df['Performance (%)'].mean() if 'Performance (%)' in filtered_df.columns and not filtered_df.empty else 0
-            st.markdown(f"""
-            <div style="background-color: rgba(77, 166, 255, 0.1); padding: 10px; border-radius: 5px; text-align: center;">
-                <p style="margin: 0; color: #9CA3AF; font-size: 0.9rem;">Avg Performance</p>
-                <p style="margin: 0; font-weight: 700; font-size: 1.5rem; color: #4DA6FF;">{avg_perf:.2f}%</p>
-                <p style="margin: 0; color: #9CA3AF; font-size: 0.9rem;">in filtered data</p>
-            </div>
-            """, unsafe_allow_html=True)
+        summary_cards = [
+            ("Showing", summary['count'], f"of {len(df)} stocks"),
+            ("Avg Price", f"${summary['avg_price']:.2f}", "in filtered data"),
+            ("Avg Performance", f"{summary['avg_perf']:.2f}%", "in filtered data")
+        ]
+        st.html(METRIC_GRID_HTML.format(cards="".join(
+            SUMMARY_CARD_HTML.format(label=label, value=value, note=note) for label, value, note in summary_cards
+        )))
         
         st.markdown("<br>", unsafe_allow_html=True)
         
@@ -770,24 +983,13 @@ elif st.session_state.page == "Data Explorer":
         else:
             # Improved styling for the dataframe
             st.markdown('<div style="background-color: #242E42; padding: 20px; border-radius: 8px;">', unsafe_allow_html=True)
-            st.dataframe(filtered_df, use_container_width=True, height=400, 
-                       column_config={
-                           "Price": st.column_config.NumberColumn(
-                               "Price ($)",
-                               format="$%.2f"
-                           ),
-                           "Performance (%)": st.column_config.NumberColumn(
-                               "Performance (%)",
-                               format="%.2f%%"
-                           ),
-                       })
+            st.dataframe(get_arrow_table(filtered_df), use_container_width=True, height=400, 
+                       column_config=EXPLORER_COLUMN_CONFIG)
             st.markdown('</div>', unsafe_allow_html=True)
             
             # Download option
             st.markdown("<br>", unsafe_allow_html=True)
-            csv_buffer = io.StringIO()
-            filtered_df.to_csv(csv_buffer, index=False)
-            csv_data = csv_buffer.getvalue()
+            csv_data = get_csv_bytes(filtered_df)
             
             col1, col2, col3 = st.columns([1, 1, 1])
             with col2:
@@ -800,89 +1002,21 @@ elif st.session_state.page == "Data Explorer":
                 )
 
 # About page
-else:
+def render_about():
     st.markdown("<h2 class='sub-header'>About StockSense Analyzer</h2>", unsafe_allow_html=True)
     
     # Create a card-like container for the about section
-    st.markdown("""
-    <div style="background-color: #242E42; color: white; border-radius: 10px; padding: 30px; box-shadow: 0 4px 12px rgba(0,0,0,0.2); margin: 10px 0 30px 0;">
-    <p style="font-size: 1.2rem; line-height: 1.6;">StockSense Analyzer is a professional stock market analysis platform designed to provide powerful insights through AI-powered natural language queries and interactive visualizations.</p>
-    
-    <h3 style="color: #4DA6FF; margin-top: 25px; font-size: 1.5rem;">Core Features</h3>
-    <div style="margin-top: 20px;">
-        <div style="display: flex; align-items: center; margin-bottom: 15px;">
-            <div style="background-color: #4DA6FF; color: white; border-radius: 50%; width: 32px; height: 32px; display: inline-flex; align-items: center; justify-content: center; margin-right: 15px; font-weight: bold;">1</div>
-            <div style="flex: 1;"><strong style="color: #4DA6FF; font-size: 1.1rem;">Natural Language Queries:</strong><br>Ask questions about stock data in plain English</div>
-        </div>
-        <div style="display: flex; align-items: center; margin-bottom: 15px;">
-            <div style="background-color: #4DA6FF; color: white; border-radius: 50%; width: 32px; height: 32px; display: inline-flex; align-items: center; justify-content: center; margin-right: 15px; font-weight: bold;">2</div>
-            <div style="flex: 1;"><strong style="color: #4DA6FF; font-size: 1.1rem;">Data Visualization:</strong><br>Interactive charts and graphs for stock analysis</div>
-        </div>
-        <div style="display: flex; align-items: center; margin-bottom: 15px;">
-            <div style="background-color: #4DA6FF; color: white; border-radius: 50%; width: 32px; height: 32px; display: inline-flex; align-items: center; justify-content: center; margin-right: 15px; font-weight: bold;">3</div>
-            <div style="flex: 1;"><strong style="color: #4DA6FF; font-size: 1.1rem;">Real-time Analysis:</strong><br>Get immediate responses to your financial queries</div>
-        </div>
-        <div style="display: flex; align-items: center; margin-bottom: 15px;">
-            <div style="background-color: #4DA6FF; color: white; border-radius: 50%; width: 32px; height: 32px; display: inline-flex; align-items: center; justify-content: center; margin-right: 15px; font-weight: bold;">4</div>
-            <div style="flex: 1;"><strong style="color: #4DA6FF; font-size: 1.1rem;">Data Exploration:</strong><br>Filter and explore the underlying stock data</div>
-        </div>
-    </div>
-    
-    <h3 style="color: #4DA6FF; margin-top: 30px; font-size: 1.5rem;">Technologies Used</h3>
-    <div style="display: grid; grid-template-columns: repeat(auto-fill, minmax(180px, 1fr)); gap: 15px; margin-top: 20px;">
-        <div style="background-color: rgba(77, 166, 255, 0.2); padding: 15px; border-radius: 8px; text-align: center; border: 1px solid rgba(77, 166, 255, 0.3);">
-            <strong style="color: #4DA6FF; font-size: 1.1rem;">Python</strong><br><span style="color: #ccc;">Data Science & Web Stack</span>
-        </div>
-        <div style="background-color: rgba(77, 166, 255, 0.2); padding: 15px; border-radius: 8px; text-align: center; border: 1px solid rgba(77, 166, 255, 0.3);">
-            <strong style="color: #4DA6FF; font-size: 1.1rem;">LangChain</strong><br><span style="color: #ccc;">AI integration</span>
-        </div>
-        <div style="background-color: rgba(77, 166, 255, 0.2); padding: 15px; border-radius: 8px; text-align: center; border: 1px solid rgba(77, 166, 255, 0.3);">
-            <strong style="color: #4DA6FF; font-size: 1.1rem;">Groq LLM</strong><br><span style="color: #ccc;">Natural Language Processing</span>
-        </div>
-        <div style="background-color: rgba(77, 166, 255, 0.2); padding: 15px; border-radius: 8px; text-align: center; border: 1px solid rgba(77, 166, 255, 0.3);">
-            <strong style="color: #4DA6FF; font-size: 1.1rem;">Pandas</strong><br><span style="color: #ccc;">Data manipulation</span>
-        </div>
-        <div style="background-color: rgba(77, 166, 255, 0.2); padding: 15px; border-radius: 8px; text-align: center; border: 1px solid rgba(77, 166, 255, 0.3);">
-            <strong style="color: #4DA6FF; font-size: 1.1rem;">Matplotlib</strong><br><span style="color: #ccc;">Visualizations</span>
-        </div>
-        <div style="background-color: rgba(77, 166, 255, 0.2); padding: 15px; border-radius: 8px; text-align: center; border: 1px solid rgba(77, 166, 255, 0.3);">
-            <strong style="color: #4DA6FF; font-size: 1.1rem;">Streamlit</strong><br><span style="color: #ccc;">Web interface</span>
-        </div>
-    </div>
-    
-    <p style="margin-top: 30px; font-style: italic; color: #ccc;">This platform is designed for investors, analysts, and financial professionals looking to gain rapid insights from stock market data using advanced AI.</p>
-    </div>
-    """, unsafe_allow_html=True)
+    st.markdown(ABOUT_HTML, unsafe_allow_html=True)
+
+# Render the selected page
+if st.session_state.page == "Dashboard":
+    render_dashboard(df, stats)
+elif st.session_state.page == "AI Analysis":
+    render_ai_analysis(df, stats)
+elif st.session_state.page == "Data Explorer":
+    render_data_explorer(df)
+else:
+    render_about()
 
 # Footer with subtle styling
-st.markdown("""
-<style>
-    .footer {
-        position: fixed;
-        bottom: 0;
-        left: 0;
-        width: 100%;
-        background-color: rgba(36, 46, 66, 0.95);
-        padding: 10px 0;
-        text-align: center;
-        font-size: 0.8rem;
-        color: #9CA3AF;
-        border-top: 1px solid rgba(77, 166, 255, 0.2);
-        backdrop-filter: blur(10px);
-        z-index: 999;
-    }
-    
-    .footer a {
-        color: #4DA6FF;
-        text-decoration: none;
-        margin: 0 10px;
-    }
-    
-    .footer a:hover {
-        text-decoration: underline;
-    }
-</style>
-<div class="footer">
-    <div>StockSense Analyzer © 2024 | Powered by <a href="https://streamlit.io" target="_blank">Streamlit</a> & <a href="https://groq.com" target="_blank">Groq AI</a></div>
-</div>
-""", unsafe_allow_html=True) 
\ No newline at end of file
+st.html(FOOTER_HTML) 
\ No newline at end of file
@@ -0,0 +1,116 @@
+"""
+Response cache module for the Stock Analysis project.
+Stores LLM responses so repeated or paraphrased queries skip the Groq API.
+"""
+
+import hashlib
+import time
+from config import (
+    SEMANTIC_CACHE_DIR,
+    SEMANTIC_CACHE_ENABLED,
+    SEMANTIC_CACHE_MODEL,
+    SEMANTIC_CACHE_THRESHOLD,
+    SEMANTIC_CACHE_TTL
+)
+
+class SemanticCache:
+    """
+    Semantic response cache backed by sentence embeddings and ChromaDB.
+    Queries whose embedding is close enough to a stored query reuse its response.
+    """
+
+    def __init__(self, path=None, threshold=None, ttl=None, enabled=None):
+        """
+        Initialize the semantic cache.
+
+        The cache is opt-in: unless enabled, every lookup misses and nothing
+        is stored, so the optional dependencies are not needed.
+
+        Args:
+            path (str, optional): Directory for the persistent store. Defaults to config value.
+            threshold (float, optional): Minimum cosine similarity for a hit. Defaults to config value.
+            ttl (float, optional): Seconds before an entry goes stale. Defaults to config value.
+            enabled (bool, optional): Whether to use the cache. Defaults to config value.
+
+        Raises:
+            ImportError: If the cache is enabled but sentence-transformers or chromadb is not installed
+        """
+        self.path = path or SEMANTIC_CACHE_DIR
+        self.threshold = threshold or SEMANTIC_CACHE_THRESHOLD
+        self.ttl = ttl or SEMANTIC_CACHE_TTL
+        self.enabled = SEMANTIC_CACHE_ENABLED if enabled is None else enabled
+        if not self.enabled:
+            return
+
+        try:
+            import chromadb
+            from sentence_transformers import SentenceTransformer
+        except ImportError as e:
+            raise ImportError(
+                "The semantic cache needs sentence-transformers and chromadb. "
+                "Install them or set SEMANTIC_CACHE_ENABLED=false."
+            ) from e
+
+        self.model = SentenceTransformer(SEMANTIC_CACHE_MODEL)
+        client = chromadb.PersistentClient(path=self.path)
+        self.collection = client.get_or_create_collection(
+            "responses",
+            metadata={"hnsw:space": "cosine"}
+        )
+
+    def _embed(self, query):
+        """Embed a query as a normalized vector."""
+        return self.model.encode(query, normalize_embeddings=True).tolist()
+
+    def get(self, query, namespace=""):
+        """
+        Look up a cached response for a semantically similar query.
+
+        Args:
+            query (str): Natural language query
+            namespace (str): Keeps entries for different data files apart
+
+        Returns:
+            str: Cached response, or None on a miss
+        """
+        if not self.enabled or self.collection.count() == 0:
+            return None
+
+        result = self.collection.query(
+            query_embeddings=[self._embed(query)],
+            n_results=1,
+            where={"namespace": namespace}
+        )
+        if not result["ids"][0]:
+            return None
+
+        # Chroma reports cosine distance, i.e. 1 - similarity
+        similarity = 1 - result["distances"][0][0]
+        metadata = result["metadatas"][0][0]
+        if similarity < self.threshold:
+            return None
+        if time.time() - metadata["ts"] > self.ttl:
+            self.collection.delete(ids=result["ids"][0])
+            return None
+
+        return result["documents"][0][0]
+
+    def add(self, query, response, namespace=""):
+        """
+        Store a response for a query.
+
+        Args:
+            query (str): Natural language query
+            response (str): Response to cache
+            namespace (str): Keeps entries for different data files apart
+        """
+        if not self.enabled:
+            return
+
+        entry_id = hashlib.sha256(f"{namespace}|{query}".encode()).hexdigest()
+        self.collection.upsert(
+            ids=[entry_id],
+            embeddings=[self._embed(query)],
+            documents=[response],
+            metadatas=[{"query": query, "namespace": namespace, "ts": time.time()}]
+        )
@@ -4,30 +4,77 @@ Loads environment variables and provides configuration settings.
 """
 
 import os
+from functools import cache
 from dotenv import load_dotenv
-import streamlit as st
-
-# Try to load environment variables from .env file
-try:
-    load_dotenv()
-except Exception as e:
-    print(f"Warning: Could not load .env file: {e}")
-
-# API Configuration - Try to get from Streamlit secrets first, then environment
-try:
-    # Check if running in Streamlit Cloud
-    GROQ_API_KEY = st.secrets.get("GROQ_API_KEY", os.getenv("GROQ_API_KEY"))
-except Exception:
-    # Fallback to environment variable
-    GROQ_API_KEY = os.getenv("GROQ_API_KEY")
+
+# Load environment variables from .env file (a missing file is not an error)
+load_dotenv()
+
+# API Configuration - Try to get from Streamlit secrets first, then environment.
+# Looked up on first use and cached, so importing config does no secrets I/O.
+@cache
+def get_groq_api_key():
+    """Return the Groq API key, or None if it is not configured."""
+    try:
+        # Check if running in Streamlit Cloud
+        import streamlit as st
+        return st.secrets.get("GROQ_API_KEY", os.getenv("GROQ_API_KEY"))
+    except Exception:
+        # Fallback to environment variable
+        return os.getenv("GROQ_API_KEY")
 
 # File paths
 DATA_FILE = os.getenv("CSV_FILE_PATH", "data/stocks.csv")
 RESULTS_FILE = os.getenv("RESULTS_FILE_PATH", "results/analysis_results.csv")
+QUERY_CACHE_DIR = os.getenv("QUERY_CACHE_DIR", "results/query_cache")
+SEMANTIC_CACHE_DIR = os.getenv("SEMANTIC_CACHE_DIR", "results/semantic_cache")
+
+# Stock data columns used by the app (anything else in the data file is skipped)
+STOCK_COLUMNS = [
+    "Stock Symbol",
+    "Stock Name",
+    "Price",
+    "Performance (%)",
+    "Market Cap (Billion)",
+    "Volume",
+    "Sector",
+    "P/E Ratio",
+]
+
+# Column types applied while parsing the stock data CSV. The numeric columns
+# stay float64: they are shown to users, and float32 turns 145.3 into 145.30000305...
+STOCK_DTYPES = {
+    "Stock Symbol": "category",
+    "Price": "float64",
+    "Performance (%)": "float64",
+    "Market Cap (Billion)": "float64",
+    "Sector": "category",
+    "P/E Ratio": "float64",
+}
 
 # Default model settings
 MODEL_TEMPERATURE = 0.5
 
+# Smaller Groq model used for the standard queries, which are simple lookups
+FAST_MODEL_NAME = "llama-3.1-8b-instant"
+
+# Maximum number of queries sent to Groq at the same time (respects rate limits)
+MAX_CONCURRENT_QUERIES = 8
+
+# HTTP connection pool for async Groq calls
+HTTP_MAX_CONNECTIONS = 50
+HTTP_MAX_KEEPALIVE_CONNECTIONS = 20
+HTTP_TIMEOUT = 30  # Seconds
+
+# Number of standard queries answered per batched LLM call
+STANDARD_QUERY_BATCH_SIZE = 4
+
+# Semantic response cache settings
+SEMANTIC_CACHE_ENABLED = os.getenv("SEMANTIC_CACHE_ENABLED", "false").lower() == "true"  # Needs sentence-transformers and chromadb
+SEMANTIC_CACHE_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+SEMANTIC_CACHE_THRESHOLD = 0.93  # Minimum cosine similarity for a cache hit
+SEMANTIC_CACHE_TTL = 1800  # Seconds before a cached response goes stale
+
 # Define standard queries
 STANDARD_QUERIES = [
     "What is the stock price of AAPL?",
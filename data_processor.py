@@ -3,45 +3,150 @@ Data processor module for the Stock Analysis project.
 Handles loading, cleaning, and processing stock data.
 """
 
+import csv
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+from pyarrow import csv as pa_csv
+import pyarrow.parquet as pq
 import os
-from config import DATA_FILE, RESULTS_FILE
+from config import DATA_FILE, RESULTS_FILE, STOCK_COLUMNS, STOCK_DTYPES
 
-def load_stock_data():
+# Numeric columns of STOCK_DTYPES, which the Parquet copy must store with the same types
+FLOAT_DTYPES = {column: dtype for column, dtype in STOCK_DTYPES.items() if dtype.startswith("float")}
+
+def parquet_path_for(csv_path):
+    """Path of the Parquet copy kept next to a CSV file."""
+    return os.path.splitext(csv_path)[0] + ".parquet"
+
+def convert_csv_to_parquet(csv_path):
     """
-    Load stock data from CSV file and perform basic cleaning.
-    Tries multiple possible file locations to improve deployment compatibility.
+    Convert a stock data CSV file to a Snappy-compressed Parquet file next to it.
     
+    Args:
+        csv_path (str): Path to the source CSV file
+        
     Returns:
-        pandas.DataFrame: Cleaned stock data
+        str: Path to the Parquet file
     """
-    # Try multiple possible file locations
-    possible_paths = [
-        DATA_FILE,
-        "data/stocks.csv",
-        "stocks.csv",
-        "sample.csv"
-    ]
+    parquet_path = parquet_path_for(csv_path)
+    _write_parquet(_read_csv(csv_path), parquet_path)
+    print(f"Converted {csv_path} to {parquet_path}")
+    
+    return parquet_path
+
+def _read_csv(path):
+    """Read only the columns the app uses from a CSV file with Arrow's multithreaded parser."""
+    # Only the header line is read here, so unused columns are never parsed
+    with open(path, newline="", encoding="utf-8-sig") as f:
+        header = next(csv.reader(f), [])
+    columns = [c for c in STOCK_COLUMNS if c in header]
     
-    df = None
-    errors = []
+    table = pa_csv.read_csv(
+        path,
+        read_options=pa_csv.ReadOptions(block_size=1 << 20),
+        convert_options=pa_csv.ConvertOptions(
+            include_columns=columns,
+            column_types={
+                column: pa.from_numpy_dtype(np.dtype(dtype)) for column, dtype in FLOAT_DTYPES.items()
+            }
+        )
+    )
+    df = table.to_pandas()
+    return df.astype({c: dtype for c, dtype in STOCK_DTYPES.items() if c in columns})
+
+def _write_parquet(df, path):
+    """Write a DataFrame to a Snappy-compressed Parquet file."""
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), path, compression="snappy")
+
+def _parquet_is_current(parquet_path, csv_path):
+    """Whether the Parquet copy is at least as new as the CSV and stores the configured float types."""
+    if not os.path.exists(parquet_path) or os.path.getmtime(parquet_path) < os.path.getmtime(csv_path):
+        return False
+    schema = pq.read_schema(parquet_path)
+    return all(
+        schema.field(column).type == pa.from_numpy_dtype(np.dtype(dtype))
+        for column, dtype in FLOAT_DTYPES.items() if column in schema.names
+    )
+
+def _read_parquet(path):
+    """Read only the columns the app uses from a Parquet file."""
+    columns = [c for c in STOCK_COLUMNS if c in pq.read_schema(path).names]
+    return pq.read_table(path, columns=columns).to_pandas()
+
+# Possible stock data locations, in order of preference, to improve deployment compatibility
+POSSIBLE_DATA_PATHS = [
+    DATA_FILE,
+    "data/stocks.csv",
+    "stocks.csv",
+    "sample.csv"
+]
+
+def find_data_file():
+    """
+    Find the stock data CSV file to load.
     
-    for path in possible_paths:
+    Returns:
+        str: First existing path in POSSIBLE_DATA_PATHS, or None if none exists
+    """
+    return next((path for path in POSSIBLE_DATA_PATHS if os.path.isfile(path)), None)
+
+def load_stock_data(path=None):
+    """
+    Load stock data and perform basic cleaning.
+    Reads the Parquet copy of the data when it is up to date, otherwise parses
+    the CSV and writes a fresh Parquet copy for the next load.
+    
+    Args:
+        path (str, optional): Path to the stock data CSV file. Defaults to find_data_file().
+    
+    Returns:
+        pandas.DataFrame: Cleaned stock data
+    """
+    path = path or find_data_file()
+    if path is None:
+        raise FileNotFoundError(f"Could not find stock data file. Tried: {POSSIBLE_DATA_PATHS}")
+    
+    parquet_path = parquet_path_for(path)
+    if _parquet_is_current(parquet_path, path):
+        df = _read_parquet(parquet_path)
+        print(f"Successfully loaded data from {parquet_path}")
+    else:
+        df = _read_csv(path)
+        print(f"Successfully loaded data from {path}")
+        
+        # One-shot migration so later loads skip CSV parsing
         try:
-            if os.path.exists(path):
-                df = pd.read_csv(path)
-                print(f"Successfully loaded data from {path}")
-                break
+            _write_parquet(df, parquet_path)
         except Exception as e:
-            errors.append(f"Error loading {path}: {str(e)}")
-    
-    if df is None:
-        error_msg = "\n".join(errors)
-        raise FileNotFoundError(f"Could not find or load stock data file. Tried: {possible_paths}. Errors: {error_msg}")
+            print(f"Warning: Could not write {parquet_path}: {e}")
     
     # Basic cleaning
-    # Remove duplicate rows based on Stock Symbol
-    df = df.drop_duplicates(subset=['Stock Symbol'])
+    # Remove duplicate rows based on Stock Symbol; a stock universe file is
+    # normally unique already, so only build the deduplicated copy when needed
+    if not df['Stock Symbol'].is_unique:
+        df = df.drop_duplicates(subset=['Stock Symbol'], keep='first')
+    
+    return optimize_dtypes(df)
+
+def optimize_dtypes(df):
+    """
+    Shrink stock data in memory by using compact column types.
+    Columns listed in config.STOCK_DTYPES get their configured type (repeated
+    labels become categories) and integer columns are downcast to the smallest
+    integer type that holds their values.
+    
+    Args:
+        df (pandas.DataFrame): Stock data
+        
+    Returns:
+        pandas.DataFrame: Stock data with compact column types
+    """
+    # astype returns a new frame, so the caller's frame is left untouched
+    df = df.astype({column: dtype for column, dtype in STOCK_DTYPES.items() if column in df.columns})
+    
+    if 'Volume' in df.columns and pd.api.types.is_integer_dtype(df['Volume']):
+        df['Volume'] = pd.to_numeric(df['Volume'], downcast='integer')
     
     return df
 
@@ -61,6 +166,60 @@ def save_analysis_results(results_df):
     
     return RESULTS_FILE
 
+def get_top_stocks_by_price(df, n=10):
+    """
+    Get the N highest-priced stocks, highest first.
+    Uses a NumPy partial partition, so only the selected rows are sorted.
+    
+    Args:
+        df (pandas.DataFrame): Stock data
+        n (int): Number of stocks to return
+        
+    Returns:
+        pandas.DataFrame: The top N rows by price
+    """
+    prices = df['Price'].to_numpy()
+    # Stocks without a price are never ranked, as with nlargest
+    valid = np.flatnonzero(~np.isnan(prices))
+    n = min(n, len(valid))
+    if n == 0:
+        return df.iloc[:0]
+    
+    valid_prices = prices[valid]
+    top = np.argpartition(valid_prices, -n)[-n:]
+    top = top[np.argsort(-valid_prices[top], kind='stable')]
+    return df.iloc[valid[top]]
+
+def get_price_histogram(df, bins=20):
+    """
+    Bin stock prices for a histogram, skipping missing prices.
+    
+    Args:
+        df (pandas.DataFrame): Stock data
+        bins (int): Number of equal-width bins
+        
+    Returns:
+        tuple: Counts per bin and the bin edges, as NumPy arrays
+    """
+    return np.histogram(df['Price'].dropna().to_numpy(), bins=bins)
+
+def build_symbol_index(df, columns=None):
+    """
+    Build a Stock Symbol -> row lookup so repeated single-symbol queries are
+    dictionary hits instead of scans over the DataFrame.
+    
+    Args:
+        df (pandas.DataFrame): Stock data, one row per symbol
+        columns (list, optional): Columns to keep for each symbol. If None, all columns are kept.
+        
+    Returns:
+        dict: Mapping of stock symbol to a dict of that stock's column values
+    """
+    indexed = df.set_index('Stock Symbol')
+    if columns is not None:
+        indexed = indexed[columns]
+    return indexed.to_dict('index')
+
 def get_stock_statistics(df):
     """
     Calculate basic statistics for the stock data.
@@ -71,13 +230,24 @@ def get_stock_statistics(df):
     Returns:
         dict: Dictionary containing statistics
     """
+    # Positional argmax on the raw arrays; nanargmax skips missing values like idxmax
+    highest_pos = np.nanargmax(df['Price'].to_numpy())
+    highest = df.iloc[highest_pos]
+    # value_counts is sorted by count, so the first entry is the largest sector
+    sector_counts = df['Sector'].value_counts()
+    # Both means come from one reduction over the numeric columns
+    means = df[['Price', 'Performance (%)']].mean()
+    
     stats = {
         'total_stocks': len(df),
-        'average_price': df['Price'].mean(),
-        'highest_price': df.loc[df['Price'].idxmax()]['Stock Symbol'],
-        'highest_pe': df.loc[df['P/E Ratio'].idxmax()]['Stock Symbol'],
-        'sectors': df['Sector'].value_counts().to_dict(),
-        'avg_performance': df['Performance (%)'].mean()
+        'average_price': means['Price'],
+        'highest_price': df['Stock Symbol'].iat[highest_pos],
+        'highest_price_stock': highest.to_dict(),
+        'highest_pe': df['Stock Symbol'].iat[np.nanargmax(df['P/E Ratio'].to_numpy())],
+        'sectors': sector_counts.to_dict(),
+        'top_sector': sector_counts.index[0],
+        'top_sector_count': int(sector_counts.iloc[0]),
+        'avg_performance': means['Performance (%)']
     }
     
     return stats 
\ No newline at end of file
@@ -4,7 +4,9 @@ Main entry point for the Stock Analysis application.
 
 import os
 import argparse
-from config import DATA_FILE, GROQ_API_KEY, STANDARD_QUERIES
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from config import DATA_FILE, STANDARD_QUERIES
 from data_processor import load_stock_data, save_analysis_results, get_stock_statistics
 from analyzer import StockAnalyzer
 from visualizer import (
@@ -19,7 +21,8 @@ def parse_args():
     parser = argparse.ArgumentParser(description='Stock Data Analysis Tool')
     parser.add_argument('--data', type=str, default=DATA_FILE,
                         help='Path to stock data CSV file')
-    parser.add_argument('--api-key', type=str, default=GROQ_API_KEY,
+    # Read the environment directly; get_groq_api_key() would import streamlit for its secrets
+    parser.add_argument('--api-key', type=str, default=os.getenv('GROQ_API_KEY'),
                         help='Groq API key (if not set in environment)')
     parser.add_argument('--query', type=str, nargs='+',
                         help='Custom queries to run (if not provided, standard queries will be used)')
@@ -92,10 +95,15 @@ def main():
         if args.visualize:
             print("Generating visualizations...")
             os.makedirs('results/plots', exist_ok=True)
-            plot_sector_distribution(df, 'results/plots/sector_distribution.png')
-            plot_price_distribution(df, 'results/plots/price_distribution.png')
-            plot_performance_by_sector(df, 'results/plots/performance_by_sector.png')
-            plot_top_stocks_by_price(df, 'results/plots/top_stocks_by_price.png')
+            # The plots are independent and each writes its own file, so build them concurrently
+            plots = [
+                partial(plot_sector_distribution, save_path='results/plots/sector_distribution.png'),
+                partial(plot_price_distribution, save_path='results/plots/price_distribution.png'),
+                partial(plot_performance_by_sector, save_path='results/plots/performance_by_sector.png'),
+                partial(plot_top_stocks_by_price, save_path='results/plots/top_stocks_by_price.png')
+            ]
+            with ThreadPoolExecutor(max_workers=len(plots)) as executor:
+                list(executor.map(lambda plot: plot(df), plots))
             print("Visualizations saved to results/plots/ directory")
         
         # Run interactive mode if requested
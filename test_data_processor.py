@@ -0,0 +1,22 @@
+"""
+Tests for the data processor module.
+"""
+
+import numpy as np
+import pandas as pd
+from data_processor import get_price_histogram, get_top_stocks_by_price
+
+def test_price_histogram_skips_missing_prices():
+    df = pd.DataFrame({'Price': [10.0, np.nan, 20.0, 30.0]})
+    
+    counts, edges = get_price_histogram(df, bins=2)
+    
+    assert counts.sum() == 3
+    assert edges[0] == 10.0 and edges[-1] == 30.0
+
+def test_top_stocks_by_price_skips_missing_prices():
+    df = pd.DataFrame({'Stock Symbol': ['A', 'B', 'C'], 'Price': [5.0, np.nan, 9.0]})
+    
+    top = get_top_stocks_by_price(df, n=3)
+    
+    assert top['Stock Symbol'].tolist() == ['C', 'A']
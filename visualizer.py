@@ -3,94 +3,100 @@ Data visualization module for the Stock Analysis project.
 Provides functions for creating charts and visualizations of stock data.
 """
 
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 import os
+from data_processor import get_top_stocks_by_price
 
-def plot_sector_distribution(df, save_path=None):
+def _output_figure(fig, save_path, description):
     """
-    Create a pie chart showing distribution of stocks by sector.
-    
+    Save a figure as an image file, or display it when no path is given.
+
     Args:
-        df (pandas.DataFrame): Stock data
+        fig (plotly.graph_objects.Figure): Figure to output
         save_path (str, optional): Path to save the plot. If None, plot is displayed.
+        description (str): Name of the plot used in the confirmation message
     """
-    plt.figure(figsize=(12, 8))
-    sector_counts = df['Sector'].value_counts()
-    plt.pie(sector_counts, labels=sector_counts.index, autopct='%1.1f%%', startangle=90)
-    plt.axis('equal')
-    plt.title('Stock Distribution by Sector')
-    
     if save_path:
         os.makedirs(os.path.dirname(save_path), exist_ok=True)
-        plt.savefig(save_path)
-        print(f"Sector distribution plot saved to: {save_path}")
+        fig.write_image(save_path)
+        print(f"{description} plot saved to: {save_path}")
     else:
-        plt.show()
+        fig.show()
+
+def plot_sector_distribution(df, save_path=None):
+    """
+    Create a pie chart showing distribution of stocks by sector.
+
+    Args:
+        df (pandas.DataFrame): Stock data
+        save_path (str, optional): Path to save the plot. If None, plot is displayed.
+
+    Returns:
+        plotly.graph_objects.Figure: The pie chart
+    """
+    import plotly.express as px
+    fig = px.pie(df, names='Sector', title='Stock Distribution by Sector', width=1200, height=800)
+    fig.update_traces(textinfo='percent')
+
+    _output_figure(fig, save_path, "Sector distribution")
+    return fig
 
 def plot_price_distribution(df, save_path=None):
     """
     Create a histogram showing the distribution of stock prices.
-    
+
     Args:
         df (pandas.DataFrame): Stock data
         save_path (str, optional): Path to save the plot. If None, plot is displayed.
+
+    Returns:
+        plotly.graph_objects.Figure: The histogram
     """
-    plt.figure(figsize=(12, 6))
-    sns.histplot(df['Price'], bins=20, kde=True)
-    plt.title('Distribution of Stock Prices')
-    plt.xlabel('Price ($)')
-    plt.ylabel('Count')
-    
-    if save_path:
-        os.makedirs(os.path.dirname(save_path), exist_ok=True)
-        plt.savefig(save_path)
-        print(f"Price distribution plot saved to: {save_path}")
-    else:
-        plt.show()
+    import plotly.express as px
+    fig = px.histogram(df, x='Price', nbins=20, marginal='violin',
+                       title='Distribution of Stock Prices', labels={'Price': 'Price ($)'},
+                       width=1200, height=600)
+    fig.update_layout(yaxis_title='Count')
+
+    _output_figure(fig, save_path, "Price distribution")
+    return fig
 
 def plot_performance_by_sector(df, save_path=None):
     """
     Create a box plot showing performance by sector.
-    
+
     Args:
         df (pandas.DataFrame): Stock data
         save_path (str, optional): Path to save the plot. If None, plot is displayed.
+
+    Returns:
+        plotly.graph_objects.Figure: The box plot
     """
-    plt.figure(figsize=(14, 8))
-    sns.boxplot(x='Sector', y='Performance (%)', data=df)
-    plt.xticks(rotation=45, ha='right')
-    plt.title('Stock Performance by Sector')
-    plt.tight_layout()
-    
-    if save_path:
-        os.makedirs(os.path.dirname(save_path), exist_ok=True)
-        plt.savefig(save_path)
-        print(f"Performance by sector plot saved to: {save_path}")
-    else:
-        plt.show()
+    import plotly.express as px
+    fig = px.box(df, x='Sector', y='Performance (%)', title='Stock Performance by Sector',
+                 width=1400, height=800)
+    fig.update_layout(xaxis_tickangle=-45)
+
+    _output_figure(fig, save_path, "Performance by sector")
+    return fig
 
 def plot_top_stocks_by_price(df, n=10, save_path=None):
     """
     Create a bar chart showing the top N stocks by price.
-    
+
     Args:
         df (pandas.DataFrame): Stock data
         n (int): Number of top stocks to display
         save_path (str, optional): Path to save the plot. If None, plot is displayed.
+
+    Returns:
+        plotly.graph_objects.Figure: The bar chart
     """
-    top_n = df.nlargest(n, 'Price')
-    
-    plt.figure(figsize=(12, 6))
-    sns.barplot(x='Stock Symbol', y='Price', data=top_n)
-    plt.title(f'Top {n} Stocks by Price')
-    plt.xticks(rotation=45, ha='right')
-    plt.tight_layout()
-    
-    if save_path:
-        os.makedirs(os.path.dirname(save_path), exist_ok=True)
-        plt.savefig(save_path)
-        print(f"Top stocks plot saved to: {save_path}")
-    else:
-        plt.show() 
\ No newline at end of file
+    import plotly.express as px
+    top_n = get_top_stocks_by_price(df, n)
+
+    fig = px.bar(top_n, x='Stock Symbol', y='Price', title=f'Top {n} Stocks by Price',
+                 width=1200, height=600)
+    fig.update_layout(xaxis_tickangle=-45)
+
+    _output_figure(fig, save_path, "Top stocks")
+    return fig